@@ -1,6 +1,9 @@
 # /src/chatsnapshot/__init__.py
 # ChatSnapshot - Observer-first event-driven architecture
 
+import importlib
+from typing import TYPE_CHECKING
+
 from .observer import Observer
 from .snapshot import ChatSnapshot
 
@@ -17,16 +20,10 @@ from .events import (
 from .storage import (
     EventStore,
     MemoryEventStore,
-    JSONEventStore,
-    SQLiteEventStore,
-    MongoDBEventStore,
 )
 
 # Ingest adapters
-from .ingest import (
-    IngestAdapter,
-    AG2IngestAdapter,
-)
+from .ingest import IngestAdapter
 
 # Projections
 from .projections import (
@@ -36,6 +33,18 @@ from .projections import (
     MarkdownTranscriptProjection,
 )
 
+if TYPE_CHECKING:
+    from .storage import JSONEventStore, SQLiteEventStore, MongoDBEventStore
+    from .ingest import AG2IngestAdapter
+
+# Optional backends and runtime adapters are imported on first use
+_LAZY_IMPORTS = {
+    "JSONEventStore": ".storage",
+    "SQLiteEventStore": ".storage",
+    "MongoDBEventStore": ".storage",
+    "AG2IngestAdapter": ".ingest",
+}
+
 __version__ = "2.0.0"
 
 __all__ = [
@@ -63,3 +72,17 @@ __all__ = [
     "TranscriptProjection",
     "MarkdownTranscriptProjection",
 ]
+
+
+def __getattr__(name: str):
+    """Import optional backends and adapters on first access (PEP 562)."""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
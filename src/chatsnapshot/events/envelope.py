@@ -1,38 +1,218 @@
 # /src/chatsnapshot/events/envelope.py
 # EventEnvelope - the canonical event structure
 
-import uuid
-from dataclasses import dataclass, field, asdict
-from datetime import datetime
-from typing import Any, Dict, Optional
+import dataclasses
+import json
+import math
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, time as dt_time, timedelta, timezone
+from enum import Enum
+from typing import Any, Dict, Optional, Union
+from uuid import UUID
 
-from .types import EventType, EventOrigin, RuntimeType
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
+from .types import (
+    EventType,
+    EventOrigin,
+    RuntimeType,
+    EVENT_TYPE_BY_VALUE,
+    EVENT_ORIGIN_BY_VALUE,
+    RUNTIME_TYPE_BY_VALUE,
+    EVENT_TYPE_VALUES,
+    EVENT_ORIGIN_VALUES,
+    RUNTIME_TYPE_VALUES,
+)
 
-@dataclass
+
+def _has_non_finite(value: Any) -> bool:
+    """Whether JSON-shaped data contains a NaN or infinite float."""
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, float):
+            if not math.isfinite(item):
+                return True
+        elif isinstance(item, dict):
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            stack.extend(item)
+    return False
+
+
+def _json_default(obj: Any) -> Any:
+    """Encode the non-JSON types orjson supports natively, for the json fallback."""
+    if isinstance(obj, (datetime, date, dt_time)):
+        return obj.isoformat()
+    if isinstance(obj, UUID):
+        return str(obj)
+    if isinstance(obj, Enum):
+        return obj.value
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def json_dumps(obj: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON bytes (orjson when available).
+
+    Both encoders accept the same input: datetimes, UUIDs, enums and
+    dataclasses are encoded as orjson does, and non-string dict keys are
+    left to json, which accepts the same key types with or without orjson.
+    NaN and infinite floats are written as NaN/Infinity like the stdlib
+    json module does; orjson would silently turn them into null.
+    """
+    if HAS_ORJSON:
+        try:
+            data = orjson.dumps(obj)
+        except TypeError:
+            # orjson is stricter than json (e.g. ints > 64 bits, non-str
+            # keys); fall through
+            pass
+        else:
+            # Non-finite floats come out as null, so only look for them then
+            if b"null" not in data or not _has_non_finite(obj):
+                return data
+    return json.dumps(obj, separators=(",", ":"), default=_json_default).encode("utf-8")
+
+
+def json_loads(data: Union[bytes, str]) -> Any:
+    """Deserialize JSON from bytes or str (orjson when available)."""
+    if HAS_ORJSON:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # Retry with json, which also accepts the NaN/Infinity tokens
+            # json_dumps (and earlier versions) write for non-finite floats
+            pass
+    return json.loads(data)
+
+
+_EPOCH = datetime(1970, 1, 1)
+_ONE_US = timedelta(microseconds=1)
+
+
+def datetime_to_us(value: datetime) -> int:
+    """Convert a datetime to integer microseconds since the epoch.
+
+    Naive datetimes are converted as-is (wall clock); aware ones are
+    normalized to UTC first. The conversion is exact.
+    """
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return (value - _EPOCH) // _ONE_US
+
+
+def us_to_datetime(value: int) -> datetime:
+    """Convert integer microseconds since the epoch back to a naive datetime."""
+    return _EPOCH + timedelta(microseconds=value)
+
+
+def parse_timestamp(value: Union[str, int]) -> datetime:
+    """Decode a serialized timestamp: an ISO 8601 string or epoch microseconds."""
+    if type(value) is int:
+        return us_to_datetime(value)
+    return datetime.fromisoformat(value)
+
+
+# Crockford base32, pre-expanded to all 2-character pairs (10 bits per lookup)
+_CROCKFORD = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+_CROCKFORD_PAIRS = [a + b for a in _CROCKFORD for b in _CROCKFORD]
+_ULID_SHIFTS = tuple(range(120, -1, -10))
+
+# Per-thread (last_ms, last_random) so IDs stay monotonic without a lock
+_ulid_state = threading.local()
+
+
+def _ulid(timestamp_ms: int) -> str:
+    """Generate a monotonic ULID: 48-bit ms timestamp + 80 random bits.
+
+    IDs generated by the same thread are strictly increasing; within one
+    millisecond the random part is incremented instead of redrawn.
+    Pre-epoch timestamps, which a ULID can't encode, are clamped to 0.
+    """
+    if timestamp_ms < 0:
+        timestamp_ms = 0
+    state = _ulid_state
+    # ms and randomness are always set together, below
+    last_ms = getattr(state, "ms", None)
+    if last_ms is not None and timestamp_ms <= last_ms:
+        timestamp_ms = last_ms
+        randomness = state.randomness + 1
+        if randomness >> 80:
+            timestamp_ms += 1
+            randomness = int.from_bytes(os.urandom(10), "big")
+    else:
+        randomness = int.from_bytes(os.urandom(10), "big")
+    state.ms = timestamp_ms
+    state.randomness = randomness
+
+    value = (timestamp_ms << 80) | randomness
+    pairs = _CROCKFORD_PAIRS
+    return "".join([pairs[(value >> shift) & 0x3FF] for shift in _ULID_SHIFTS])
+
+
+# Decoded EventSource instances, keyed by their raw (origin, runtime, agent_name)
+_SOURCE_CACHE: Dict[tuple, "EventSource"] = {}
+_SOURCE_CACHE_MAX = 1024
+
+
+@dataclass(slots=True, frozen=True)
 class EventSource:
-    """Source metadata for an event."""
+    """Source metadata for an event.
+
+    Frozen, so a single instance can safely be shared by many envelopes.
+    """
     origin: EventOrigin
     runtime: RuntimeType = RuntimeType.NONE
     agent_name: Optional[str] = None
 
     def to_dict(self) -> Dict[str, Any]:
         return {
-            "origin": self.origin.value,
-            "runtime": self.runtime.value,
+            "origin": EVENT_ORIGIN_VALUES[self.origin],
+            "runtime": RUNTIME_TYPE_VALUES[self.runtime],
             "agent_name": self.agent_name
         }
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "EventSource":
-        return cls(
-            origin=EventOrigin(data["origin"]),
-            runtime=RuntimeType(data.get("runtime", "none")),
-            agent_name=data.get("agent_name")
-        )
+        """Deserialize from dictionary."""
+        return cls.from_values(data["origin"], data.get("runtime", "none"), data.get("agent_name"))
+
+    @classmethod
+    def from_values(cls, origin: str, runtime: str = "none", agent_name: Optional[str] = None) -> "EventSource":
+        """Build a source from its raw field values.
+
+        A stream has few distinct sources, so decoded instances are shared
+        (safe because EventSource is frozen).
+        """
+        key = (origin, runtime, agent_name)
+        source = _SOURCE_CACHE.get(key)
+        if source is None:
+            source = cls(
+                origin=EVENT_ORIGIN_BY_VALUE.get(origin) or EventOrigin(origin),
+                runtime=RUNTIME_TYPE_BY_VALUE.get(runtime) or RuntimeType(runtime),
+                agent_name=agent_name
+            )
+            if cls is EventSource:
+                if len(_SOURCE_CACHE) >= _SOURCE_CACHE_MAX:
+                    _SOURCE_CACHE.clear()
+                _SOURCE_CACHE[key] = source
+        return source
 
 
-@dataclass
+# Shared default source for events recorded without one (EventSource is frozen)
+_DEFAULT_SOURCE = EventSource(origin=EventOrigin.SYSTEM)
+
+
+@dataclass(slots=True, frozen=True)
 class EventEnvelope:
     """Canonical event envelope for the ChatSnapshot observer system.
 
@@ -43,6 +223,10 @@ class EventEnvelope:
     - Causally linked
     - Ordered per correlation scope
     - JSON serializable
+
+    The payload dict is borrowed, not copied: create() stores the dict it
+    is given, so callers must not mutate it after recording. Code that
+    needs a modified payload builds a new dict ({**payload, ...}).
     """
     event_id: str
     event_type: EventType
@@ -59,14 +243,27 @@ class EventEnvelope:
         correlation_id: str,
         payload: Dict[str, Any],
         source: Optional[EventSource] = None,
-        causation_id: Optional[str] = None
+        causation_id: Optional[str] = None,
+        timestamp: Optional[datetime] = None
     ) -> "EventEnvelope":
-        """Factory method to create a new EventEnvelope with auto-generated ID and timestamp."""
+        """Factory method to create a new EventEnvelope with auto-generated ID and timestamp.
+
+        The event_id is a ULID derived from the same clock read as the
+        timestamp, so IDs sort in creation order. Pass timestamp to stamp
+        the event with a time the caller already has (e.g. when ingesting
+        external events) instead of reading the clock.
+        """
+        if timestamp is None:
+            now_ns = time.time_ns()
+            timestamp_ms = now_ns // 1_000_000
+            timestamp = datetime.fromtimestamp(now_ns / 1e9)
+        else:
+            timestamp_ms = int(timestamp.timestamp() * 1000)
         return cls(
-            event_id=str(uuid.uuid4()),
+            event_id=_ulid(timestamp_ms),
             event_type=event_type,
-            timestamp=datetime.now(),
-            source=source or EventSource(origin=EventOrigin.SYSTEM),
+            timestamp=timestamp,
+            source=source or _DEFAULT_SOURCE,
             correlation_id=correlation_id,
             payload=payload,
             causation_id=causation_id
@@ -76,7 +273,7 @@ class EventEnvelope:
         """Serialize to JSON-compatible dictionary."""
         return {
             "event_id": self.event_id,
-            "event_type": self.event_type.value,
+            "event_type": EVENT_TYPE_VALUES[self.event_type],
             "timestamp": self.timestamp.isoformat(),
             "source": self.source.to_dict(),
             "correlation_id": self.correlation_id,
@@ -84,13 +281,27 @@ class EventEnvelope:
             "causation_id": self.causation_id
         }
 
+    def to_json_bytes(self) -> bytes:
+        """Serialize to compact JSON bytes."""
+        return json_dumps(self.to_dict())
+
+    @classmethod
+    def from_json(cls, data: Union[bytes, str]) -> "EventEnvelope":
+        """Deserialize from JSON bytes or str."""
+        return cls.from_dict(json_loads(data))
+
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "EventEnvelope":
-        """Deserialize from dictionary."""
+        """Deserialize from dictionary.
+
+        The timestamp may be an ISO 8601 string (as written by to_dict) or
+        integer microseconds since the epoch.
+        """
+        event_type = data["event_type"]
         return cls(
             event_id=data["event_id"],
-            event_type=EventType(data["event_type"]),
-            timestamp=datetime.fromisoformat(data["timestamp"]),
+            event_type=EVENT_TYPE_BY_VALUE.get(event_type) or EventType(event_type),
+            timestamp=parse_timestamp(data["timestamp"]),
             source=EventSource.from_dict(data["source"]),
             correlation_id=data["correlation_id"],
             payload=data.get("payload", {}),
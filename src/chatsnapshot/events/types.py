@@ -2,6 +2,7 @@
 # Event type definitions for the Observer pattern
 
 from enum import Enum
+from typing import Dict
 
 
 class EventType(str, Enum):
@@ -50,3 +51,17 @@ class RuntimeType(str, Enum):
     CREWAI = "crewai"
     CUSTOM = "custom"
     NONE = "none"
+
+
+# Value -> member lookup tables. Decoding stored events with a dict lookup
+# avoids the Enum metaclass __call__ (value map lookup + _missing_ hook) per
+# field; fall back to calling the Enum for unknown values to get its error.
+EVENT_TYPE_BY_VALUE: Dict[str, EventType] = {member.value: member for member in EventType}
+EVENT_ORIGIN_BY_VALUE: Dict[str, EventOrigin] = {member.value: member for member in EventOrigin}
+RUNTIME_TYPE_BY_VALUE: Dict[str, RuntimeType] = {member.value: member for member in RuntimeType}
+
+# Member -> value lookup tables. Enum.value is a property that costs several
+# times a dict lookup; serializers on the hot path use these instead.
+EVENT_TYPE_VALUES: Dict[EventType, str] = {member: member.value for member in EventType}
+EVENT_ORIGIN_VALUES: Dict[EventOrigin, str] = {member: member.value for member in EventOrigin}
+RUNTIME_TYPE_VALUES: Dict[RuntimeType, str] = {member: member.value for member in RuntimeType}
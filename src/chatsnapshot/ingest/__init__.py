@@ -1,10 +1,34 @@
 # /src/chatsnapshot/ingest/__init__.py
 # Framework-specific ingest adapters
 
+import importlib
+from typing import TYPE_CHECKING
+
 from .base import IngestAdapter
-from .ag2 import AG2IngestAdapter
+
+if TYPE_CHECKING:
+    from .ag2 import AG2IngestAdapter
+
+# Runtime-specific adapters are imported on first use
+_LAZY_IMPORTS = {
+    "AG2IngestAdapter": ".ag2",
+}
 
 __all__ = [
     "IngestAdapter",
     "AG2IngestAdapter",
 ]
+
+
+def __getattr__(name: str):
+    """Import runtime adapters on first access (PEP 562)."""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
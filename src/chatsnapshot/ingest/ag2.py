@@ -21,13 +21,35 @@ class AG2IngestAdapter(IngestAdapter):
 
     def __init__(self, observer: Observer, correlation_id: Optional[str] = None):
         super().__init__(observer, correlation_id)
+        # EventSource is frozen, so one instance per agent is shared by all its events
+        self._source_cache: Dict[Optional[str], EventSource] = {}
 
     def _create_source(self, agent_name: Optional[str] = None) -> EventSource:
-        """Create an EventSource for AG2 events."""
-        return EventSource(
-            origin=EventOrigin.AGENT,
-            runtime=RuntimeType.AG2,
-            agent_name=agent_name
+        """Get the (cached) EventSource for AG2 events from an agent."""
+        source = self._source_cache.get(agent_name)
+        if source is None:
+            source = EventSource(
+                origin=EventOrigin.AGENT,
+                runtime=RuntimeType.AG2,
+                agent_name=agent_name
+            )
+            self._source_cache[agent_name] = source
+        return source
+
+    def _build_event(
+        self,
+        event_type: EventType,
+        correlation_id: str,
+        payload: Dict[str, Any],
+        agent_name: Optional[str]
+    ) -> EventEnvelope:
+        """Build an envelope chained to the last event of its correlation_id."""
+        return EventEnvelope.create(
+            event_type,
+            correlation_id,
+            payload,
+            self._create_source(agent_name),
+            self._last_event_ids.get(correlation_id)
         )
 
     async def record(self, raw_event: Any, correlation_id: Optional[str] = None) -> EventEnvelope:
@@ -42,13 +64,12 @@ class AG2IngestAdapter(IngestAdapter):
         # Determine event type from raw_event structure
         event_type, payload, agent_name = self._normalize_event(raw_event)
 
-        event = await self._observer.record(
-            event_type=event_type,
-            correlation_id=corr_id,
-            payload=payload,
-            source=self._create_source(agent_name),
-            causation_id=self._last_event_id
-        )
+        event = await self._observer.record_raw(self._build_event(
+            event_type,
+            corr_id,
+            payload,
+            agent_name
+        ))
 
         self._update_last_event(event)
         return event
@@ -75,22 +96,24 @@ class AG2IngestAdapter(IngestAdapter):
         )
 
     def _normalize_dict_event(self, event: Dict[str, Any]) -> tuple:
-        """Normalize a dictionary event."""
-        # Extract agent name if present
-        agent_name = event.get("name") or event.get("agent_name")
-
-        # Determine event type based on content
-        if "tool_calls" in event or "function_call" in event:
-            return (EventType.EXECUTION_TOOL_CALL, event, agent_name)
-
-        if "tool_call_id" in event or event.get("role") == "tool":
-            return (EventType.EXECUTION_TOOL_RESULT, event, agent_name)
+        """Normalize a dictionary event.
 
-        if "content" in event or "message" in event:
-            return (EventType.EXECUTION_MESSAGE, event, agent_name)
+        The event dict itself is used as the payload (no copy).
+        """
+        keys = event.keys()
 
-        # Default to state change
-        return (EventType.EXECUTION_STATE_CHANGE, event, agent_name)
+        # Determine event type based on content
+        if "tool_calls" in keys or "function_call" in keys:
+            event_type = EventType.EXECUTION_TOOL_CALL
+        elif "tool_call_id" in keys or event.get("role") == "tool":
+            event_type = EventType.EXECUTION_TOOL_RESULT
+        elif "content" in keys or "message" in keys:
+            event_type = EventType.EXECUTION_MESSAGE
+        else:
+            # Default to state change
+            event_type = EventType.EXECUTION_STATE_CHANGE
+
+        return (event_type, event, event.get("name") or event.get("agent_name"))
 
     # ========== Convenience Methods for Common AG2 Events ==========
 
@@ -105,17 +128,18 @@ class AG2IngestAdapter(IngestAdapter):
         if not corr_id:
             raise ValueError("correlation_id is required")
 
-        payload = dict(message)
-        if agent_name:
-            payload["agent_name"] = agent_name
+        # Borrow the message as the payload; copy only when agent_name must be added
+        if agent_name and message.get("agent_name") != agent_name:
+            payload = {**message, "agent_name": agent_name}
+        else:
+            payload = message
 
-        event = await self._observer.record(
-            event_type=EventType.EXECUTION_MESSAGE,
-            correlation_id=corr_id,
-            payload=payload,
-            source=self._create_source(agent_name),
-            causation_id=self._last_event_id
-        )
+        event = await self._observer.record_raw(self._build_event(
+            EventType.EXECUTION_MESSAGE,
+            corr_id,
+            payload,
+            agent_name
+        ))
 
         self._update_last_event(event)
         return event
@@ -132,17 +156,16 @@ class AG2IngestAdapter(IngestAdapter):
         if not corr_id:
             raise ValueError("correlation_id is required")
 
-        event = await self._observer.record(
-            event_type=EventType.EXECUTION_TOOL_CALL,
-            correlation_id=corr_id,
-            payload={
+        event = await self._observer.record_raw(self._build_event(
+            EventType.EXECUTION_TOOL_CALL,
+            corr_id,
+            {
                 "tool_name": tool_name,
                 "arguments": arguments,
                 "agent_name": agent_name
             },
-            source=self._create_source(agent_name),
-            causation_id=self._last_event_id
-        )
+            agent_name
+        ))
 
         self._update_last_event(event)
         return event
@@ -159,17 +182,16 @@ class AG2IngestAdapter(IngestAdapter):
         if not corr_id:
             raise ValueError("correlation_id is required")
 
-        event = await self._observer.record(
-            event_type=EventType.EXECUTION_TOOL_RESULT,
-            correlation_id=corr_id,
-            payload={
+        event = await self._observer.record_raw(self._build_event(
+            EventType.EXECUTION_TOOL_RESULT,
+            corr_id,
+            {
                 "tool_name": tool_name,
                 "result": result,
                 "agent_name": agent_name
             },
-            source=self._create_source(agent_name),
-            causation_id=self._last_event_id
-        )
+            agent_name
+        ))
 
         self._update_last_event(event)
         return event
@@ -185,16 +207,15 @@ class AG2IngestAdapter(IngestAdapter):
         if not corr_id:
             raise ValueError("correlation_id is required")
 
-        event = await self._observer.record(
-            event_type=EventType.EXECUTION_HANDOFF,
-            correlation_id=corr_id,
-            payload={
+        event = await self._observer.record_raw(self._build_event(
+            EventType.EXECUTION_HANDOFF,
+            corr_id,
+            {
                 "from_agent": from_agent,
                 "to_agent": to_agent
             },
-            source=self._create_source(from_agent),
-            causation_id=self._last_event_id
-        )
+            from_agent
+        ))
 
         self._update_last_event(event)
         return event
@@ -215,32 +236,22 @@ class AG2IngestAdapter(IngestAdapter):
         if not corr_id:
             raise ValueError("correlation_id is required")
 
-        events = []
-
+        messages = []
         for agent in agents:
             if not hasattr(agent, "_oai_messages"):
                 continue
 
-            for other_agent, messages in agent._oai_messages.items():
-                for msg in messages:
+            for other_agent, agent_messages in agent._oai_messages.items():
+                for msg in agent_messages:
                     event_type, payload, _ = self._normalize_dict_event(msg)
 
-                    # Add agent name if not present
+                    # Add agent name if not present (without mutating the agent's history)
                     if "name" not in payload and "agent_name" not in payload:
-                        payload["agent_name"] = agent.name
-
-                    event = await self._observer.record(
-                        event_type=event_type,
-                        correlation_id=corr_id,
-                        payload=payload,
-                        source=self._create_source(agent.name),
-                        causation_id=self._last_event_id
-                    )
+                        payload = {**payload, "agent_name": agent.name}
 
-                    self._update_last_event(event)
-                    events.append(event)
+                    messages.append((event_type, payload, agent.name))
 
-        return events
+        return await self._record_batch(messages, corr_id)
 
     async def extract_from_groupchat(
         self,
@@ -252,20 +263,33 @@ class AG2IngestAdapter(IngestAdapter):
         if not corr_id:
             raise ValueError("correlation_id is required")
 
-        events = []
+        messages = [self._normalize_dict_event(msg) for msg in groupchat.messages]
+        return await self._record_batch(messages, corr_id)
 
-        for msg in groupchat.messages:
-            event_type, payload, agent_name = self._normalize_dict_event(msg)
+    async def _record_batch(
+        self,
+        messages: List[tuple],
+        correlation_id: str
+    ) -> List[EventEnvelope]:
+        """Record normalized (event_type, payload, agent_name) tuples in one bulk write.
 
-            event = await self._observer.record(
+        Envelopes are built up front with their causation_ids chained in
+        order, then handed to the Observer as a single batch.
+        """
+        events = []
+        causation_id = self._last_event_ids.get(correlation_id)
+        for event_type, payload, agent_name in messages:
+            event = EventEnvelope.create(
                 event_type=event_type,
-                correlation_id=corr_id,
+                correlation_id=correlation_id,
                 payload=payload,
                 source=self._create_source(agent_name),
-                causation_id=self._last_event_id
+                causation_id=causation_id
             )
-
-            self._update_last_event(event)
+            causation_id = event.event_id
             events.append(event)
 
+        await self._observer.record_many(events)
+        if events:
+            self._update_last_event(events[-1])
         return events
@@ -2,7 +2,7 @@
 # Abstract IngestAdapter base class
 
 from abc import ABC, abstractmethod
-from typing import Any, Optional
+from typing import Any, Dict, Optional
 
 from ..observer import Observer
 from ..events.envelope import EventEnvelope
@@ -29,7 +29,8 @@ class IngestAdapter(ABC):
         """
         self._observer = observer
         self._correlation_id = correlation_id
-        self._last_event_id: Optional[str] = None
+        # Last recorded event ID per correlation_id, for causation linking
+        self._last_event_ids: Dict[str, str] = {}
 
     @property
     def observer(self) -> Observer:
@@ -47,8 +48,14 @@ class IngestAdapter(ABC):
 
     @property
     def last_event_id(self) -> Optional[str]:
-        """Get the last recorded event ID (for causation linking)."""
-        return self._last_event_id
+        """Get the last recorded event ID for the current correlation_id."""
+        if self._correlation_id is None:
+            return None
+        return self._last_event_ids.get(self._correlation_id)
+
+    def get_last_event_id(self, correlation_id: str) -> Optional[str]:
+        """Get the last recorded event ID for a correlation_id (for causation linking)."""
+        return self._last_event_ids.get(correlation_id)
 
     @abstractmethod
     async def record(self, raw_event: Any, correlation_id: Optional[str] = None) -> EventEnvelope:
@@ -65,4 +72,4 @@ class IngestAdapter(ABC):
 
     def _update_last_event(self, event: EventEnvelope) -> None:
         """Update the last event ID for causation tracking."""
-        self._last_event_id = event.event_id
+        self._last_event_ids[event.correlation_id] = event.event_id
@@ -2,19 +2,28 @@
 # Core Observer class - async-first with pub/sub support
 
 import asyncio
+import copy
+import itertools
 import logging
-import uuid
+from collections import OrderedDict
 from datetime import datetime
-from typing import Any, Awaitable, Callable, Dict, List, Optional
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Hashable, List, Optional, Sequence, Tuple, TypeVar
 
 from .events.envelope import EventEnvelope, EventSource
-from .events.types import EventType, EventOrigin
+from .events.types import EventType
 from .storage.base import EventStore
+from .storage.batching import WriteBatcher
+from .projections.base import Projection
+from .snapshot import ChatSnapshot
 
 
+logger = logging.getLogger(__name__)
+
 # Type alias for subscription callbacks
 SubscriptionCallback = Callable[[EventEnvelope], Awaitable[None]]
 
+T = TypeVar("T")
+
 
 class Observer:
     """Core Observer for the ChatSnapshot event-driven architecture.
@@ -28,10 +37,59 @@ class Observer:
     Everything flows through the Observer.
     """
 
-    def __init__(self, event_store: EventStore):
+    def __init__(
+        self,
+        event_store: EventStore,
+        projection_cache_size: int = 0,
+        snapshot_cache: bool = False,
+        batch_writes: bool = False,
+        batch_size: int = 256,
+        batch_timeout_ms: float = 0.0
+    ):
+        """Initialize the Observer.
+
+        Args:
+            event_store: The EventStore to record events to
+            projection_cache_size: Maximum number of projection results kept
+                by project() (0 disables caching, the default). Only enable
+                it when this Observer is the sole writer to the store.
+            snapshot_cache: Maintain a live ChatSnapshot per correlation_id,
+                updated as events are recorded (see get_snapshot())
+            batch_writes: Coalesce appends from concurrent record() calls into
+                one store.append_many() call. Each record() still returns only
+                after its event is stored. Useful for stores without their own
+                write batching (JSON, MongoDB). If a combined write fails and
+                the store's append_many isn't atomic, every record() in that
+                batch raises, as some of the events may have been stored.
+            batch_size: Maximum number of events per append_many() call
+            batch_timeout_ms: How long to wait for more events before flushing
+                a partial batch (0 = flush whatever is already queued)
+        """
         self._store = event_store
         self._subscriptions: Dict[str, SubscriptionCallback] = {}
-        self._logger = logging.getLogger(__name__)
+        # Parallel tuples rebuilt on (un)subscribe, iterated on every event
+        self._subscription_ids: Tuple[str, ...] = ()
+        self._callbacks: Tuple[SubscriptionCallback, ...] = ()
+        # Subscription IDs only need to be unique within this Observer
+        self._next_subscription_id = itertools.count(1)
+        # Queued subscriptions: subscription_id -> (queue, consumer task, set once unsubscribed)
+        self._subscriber_queues: Dict[str, Tuple[asyncio.Queue, asyncio.Task, asyncio.Event]] = {}
+        # Latest event_id per correlation_id, as recorded through this Observer
+        self._tips: Dict[str, str] = {}
+        # (correlation_id, projection cache key) -> (tip event_id, result), in LRU order
+        self._projection_cache: "OrderedDict[Tuple[str, Hashable], Tuple[str, Any]]" = OrderedDict()
+        self._projection_cache_size = projection_cache_size
+        # Live snapshots per correlation_id (None when snapshot_cache is off)
+        self._snapshots: Optional[Dict[str, Optional[ChatSnapshot]]] = {} if snapshot_cache else None
+        # Write coalescing (None when batch_writes is off); started by initialize()
+        self._batcher: Optional[WriteBatcher[EventEnvelope]] = None
+        if batch_writes:
+            self._batcher = WriteBatcher(
+                self._store.append_many,
+                batch_size=batch_size,
+                batch_timeout_ms=batch_timeout_ms,
+                atomic=self._store.atomic_append_many
+            )
 
     @property
     def store(self) -> EventStore:
@@ -46,7 +104,8 @@ class Observer:
         correlation_id: str,
         payload: Dict[str, Any],
         source: Optional[EventSource] = None,
-        causation_id: Optional[str] = None
+        causation_id: Optional[str] = None,
+        timestamp: Optional[datetime] = None
     ) -> EventEnvelope:
         """Record an event and notify subscribers.
 
@@ -56,6 +115,7 @@ class Observer:
             payload: Event-specific data
             source: Where the event originated (optional)
             causation_id: The event that caused this one (optional)
+            timestamp: When the event happened (optional, defaults to now)
 
         Returns:
             The created EventEnvelope
@@ -64,27 +124,56 @@ class Observer:
             event_type=event_type,
             correlation_id=correlation_id,
             payload=payload,
-            source=source or EventSource(origin=EventOrigin.SYSTEM),
-            causation_id=causation_id
+            source=source,
+            causation_id=causation_id,
+            timestamp=timestamp
         )
+        return await self.record_raw(event)
 
-        # Append to store
-        await self._store.append(event)
-        self._logger.debug(f"Recorded event: {event.event_id} ({event.event_type})")
+    async def record_raw(self, event: EventEnvelope) -> EventEnvelope:
+        """Record a pre-constructed event and notify subscribers.
 
-        # Notify subscribers (fire and forget, don't block)
+        Useful when replaying events or ingesting from external sources,
+        and as the fast path for callers that build envelopes themselves.
+
+        Returns:
+            The recorded EventEnvelope
+        """
+        if self._batcher is not None:
+            await self._batcher.submit(event)
+        else:
+            await self._store.append(event)
+        self._tips[event.correlation_id] = event.event_id
+        if self._snapshots is not None:
+            self._apply_to_snapshot(event)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Recorded event: {event.event_id} ({event.event_type})")
+
+        # Notify subscribers
         await self._notify_subscribers(event)
 
         return event
 
-    async def record_raw(self, event: EventEnvelope) -> None:
-        """Record a pre-constructed event.
+    async def record_many(self, events: Sequence[EventEnvelope]) -> None:
+        """Record several pre-constructed events with one bulk store write.
 
-        Useful when replaying events or ingesting from external sources.
+        Subscribers are notified once the whole batch is stored: each
+        subscriber receives the events in order, and different subscribers
+        are served concurrently (one gather per batch, not per event).
         """
-        await self._store.append(event)
-        self._logger.debug(f"Recorded raw event: {event.event_id}")
-        await self._notify_subscribers(event)
+        if not events:
+            return
+        if self._batcher is not None:
+            await self._batcher.submit_many(events)
+        else:
+            await self._store.append_many(events)
+        for event in events:
+            self._tips[event.correlation_id] = event.event_id
+            if self._snapshots is not None:
+                self._apply_to_snapshot(event)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Recorded {len(events)} events")
+        await self._notify_subscribers_many(events)
 
     # ========== Querying ==========
 
@@ -108,25 +197,151 @@ class Observer:
         """Get total event count."""
         return await self._store.count()
 
+    def iter_events(self, correlation_id: str) -> AsyncIterator[EventEnvelope]:
+        """Stream events for a correlation_id, ordered by timestamp."""
+        return self._store.iter_query(correlation_id)
+
+    def iter_events_by_type(self, event_type: EventType) -> AsyncIterator[EventEnvelope]:
+        """Stream events of a specific type, ordered by timestamp."""
+        return self._store.iter_by_type(event_type)
+
+    def iter_events_since(self, timestamp: datetime) -> AsyncIterator[EventEnvelope]:
+        """Stream events since a timestamp, ordered by timestamp."""
+        return self._store.iter_since(timestamp)
+
+    def iter_all_events(self) -> AsyncIterator[EventEnvelope]:
+        """Stream all events, ordered by timestamp."""
+        return self._store.iter_all()
+
+    # ========== Projections ==========
+
+    def get_snapshot(self, correlation_id: str) -> Optional[ChatSnapshot]:
+        """Get the live ChatSnapshot for a correlation_id.
+
+        Requires snapshot_cache=True. The snapshot covers events recorded
+        through this Observer and is updated in place as new events arrive;
+        treat it as read-only.
+
+        Returns:
+            The snapshot, or None if no events were recorded for it or
+            updating it failed (the error is logged)
+        """
+        if self._snapshots is None:
+            raise RuntimeError("Observer was created without snapshot_cache=True")
+        return self._snapshots.get(correlation_id)
+
+    def _apply_to_snapshot(self, event: EventEnvelope) -> None:
+        """Fold a recorded event into the live snapshot of its correlation_id.
+
+        The event is already stored, so a failure here must not fail
+        record(): it is logged and the snapshot is dropped (left as None,
+        so later events don't rebuild it from a partial stream).
+        """
+        correlation_id = event.correlation_id
+        snapshot = self._snapshots.get(correlation_id)
+        if snapshot is None and correlation_id in self._snapshots:
+            return  # Dropped after an earlier failure
+        try:
+            if snapshot is None:
+                self._snapshots[correlation_id] = ChatSnapshot.from_event(event)
+            else:
+                snapshot.apply(event)
+        except Exception as e:
+            self._snapshots[correlation_id] = None
+            logger.error(f"Live snapshot for {correlation_id} failed on event {event.event_id}: {e}")
+
+    async def project(self, correlation_id: str, projection: Projection[T]) -> T:
+        """Project the events of a correlation_id, reusing cached results.
+
+        With projection_cache_size > 0, results are cached per
+        (correlation_id, projection.cache_key()) and tagged with the last
+        event_id they cover. A cached result is reused while that is still
+        the latest event recorded through this Observer for the
+        correlation_id. Events written to the store any other way (another
+        Observer or process, direct store.append) are not seen, so only
+        enable the cache when this Observer is the store's sole writer.
+        Each call returns its own copy of a cached result.
+
+        Args:
+            correlation_id: The correlation_id whose events to project
+            projection: The projection to apply
+
+        Returns:
+            The projected output
+        """
+        key = None
+        if self._projection_cache_size > 0:
+            try:
+                key = (correlation_id, projection.cache_key())
+                hash(key)
+            except TypeError:
+                key = None
+
+        # Read before the query: a record() during the await moves the tip on
+        tip = self._tips.get(correlation_id)
+        if key is not None and tip is not None:
+            cached = self._projection_cache.get(key)
+            if cached is not None and cached[0] == tip:
+                self._projection_cache.move_to_end(key)
+                return copy.deepcopy(cached[1])
+
+        events = await self._store.query(correlation_id)
+        result = projection.project(events)
+
+        if key is not None and events:
+            last_event_id = events[-1].event_id
+            if tip is None:
+                # Not recorded through this Observer yet: the stored stream is the baseline
+                self._tips.setdefault(correlation_id, last_event_id)
+            self._projection_cache[key] = (last_event_id, copy.deepcopy(result))
+            self._projection_cache.move_to_end(key)
+            if len(self._projection_cache) > self._projection_cache_size:
+                self._projection_cache.popitem(last=False)
+
+        return result
+
     # ========== Subscriptions (Pub/Sub) ==========
 
-    def subscribe(self, callback: SubscriptionCallback) -> str:
+    def subscribe(self, callback: SubscriptionCallback, queue_size: Optional[int] = None) -> str:
         """Subscribe to real-time events.
 
+        By default the callback is awaited inline by record(), so it has seen
+        the event by the time record() returns. With queue_size set, events
+        are put on a bounded queue drained by a dedicated consumer task
+        instead: a slow subscriber then only delays record() once its queue
+        is full. Queued subscriptions require a running event loop.
+
         Args:
             callback: Async function called for each new event
+            queue_size: Buffer events for this subscriber in a queue of this
+                size, at least 1 (None = deliver inline)
 
         Returns:
             Subscription ID (use to unsubscribe)
         """
-        subscription_id = str(uuid.uuid4())
+        if queue_size is not None and queue_size < 1:
+            # asyncio.Queue(maxsize=0) is unbounded, which would disable backpressure
+            raise ValueError(f"queue_size must be at least 1, got {queue_size}")
+        subscription_id = f"sub-{next(self._next_subscription_id)}"
+        if queue_size is not None:
+            queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+            task = asyncio.get_running_loop().create_task(
+                self._pump_subscriber(subscription_id, callback, queue)
+            )
+            removed = asyncio.Event()
+            self._subscriber_queues[subscription_id] = (queue, task, removed)
+            callback = self._make_enqueue(subscription_id, queue, removed)
         self._subscriptions[subscription_id] = callback
-        self._logger.debug(f"New subscription: {subscription_id}")
+        self._rebuild_callbacks()
+        logger.debug(f"New subscription: {subscription_id}")
         return subscription_id
 
     def unsubscribe(self, subscription_id: str) -> bool:
         """Unsubscribe from events.
 
+        Events still queued for a queued subscription are discarded, and
+        record() calls waiting for room in its full queue stop waiting.
+
         Args:
             subscription_id: The ID returned from subscribe()
 
@@ -135,23 +350,107 @@ class Observer:
         """
         if subscription_id in self._subscriptions:
             del self._subscriptions[subscription_id]
-            self._logger.debug(f"Unsubscribed: {subscription_id}")
+            self._rebuild_callbacks()
+            queued = self._subscriber_queues.pop(subscription_id, None)
+            if queued is not None:
+                queue, task, removed = queued
+                # Release record() calls waiting for room in the queue first:
+                # once the consumer task is gone nothing would ever make room
+                removed.set()
+                task.cancel()
+            logger.debug(f"Unsubscribed: {subscription_id}")
             return True
         return False
 
+    def _make_enqueue(
+        self,
+        subscription_id: str,
+        queue: asyncio.Queue,
+        removed: asyncio.Event
+    ) -> SubscriptionCallback:
+        """Build the callback that hands events to a queued subscriber.
+
+        When the queue is full it waits for room, or drops the event if the
+        subscription is removed meanwhile.
+        """
+        async def enqueue(event: EventEnvelope) -> None:
+            try:
+                queue.put_nowait(event)
+                return
+            except asyncio.QueueFull:
+                logger.warning(f"Subscription {subscription_id} is falling behind (queue full)")
+            put = asyncio.ensure_future(queue.put(event))
+            unsubscribed = asyncio.ensure_future(removed.wait())
+            try:
+                await asyncio.wait((put, unsubscribed), return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                put.cancel()
+                unsubscribed.cancel()
+        return enqueue
+
+    async def _pump_subscriber(
+        self,
+        subscription_id: str,
+        callback: SubscriptionCallback,
+        queue: asyncio.Queue
+    ) -> None:
+        """Deliver queued events to a subscriber, one at a time and in order."""
+        while True:
+            event = await queue.get()
+            try:
+                await self._safe_callback(subscription_id, callback, event)
+            finally:
+                queue.task_done()
+
+    def _rebuild_callbacks(self) -> None:
+        """Refresh the id/callback tuples after the subscriptions changed."""
+        self._subscription_ids = tuple(self._subscriptions)
+        self._callbacks = tuple(self._subscriptions.values())
+
     async def _notify_subscribers(self, event: EventEnvelope) -> None:
         """Notify all subscribers of a new event."""
-        if not self._subscriptions:
+        # Immutable tuples, so callbacks may (un)subscribe while being notified
+        callbacks = self._callbacks
+        if not callbacks:
+            return
+        subscription_ids = self._subscription_ids
+
+        # Single subscriber: await it directly, no gather/future overhead
+        if len(callbacks) == 1:
+            await self._safe_callback(subscription_ids[0], callbacks[0], event)
+            return
+
+        # Run all callbacks concurrently (_safe_callback never raises)
+        await asyncio.gather(*[
+            self._safe_callback(sub_id, callback, event)
+            for sub_id, callback in zip(subscription_ids, callbacks)
+        ])
+
+    async def _notify_subscribers_many(self, events: Sequence[EventEnvelope]) -> None:
+        """Notify all subscribers of a batch of new events."""
+        callbacks = self._callbacks
+        if not callbacks:
+            return
+        subscription_ids = self._subscription_ids
+
+        if len(callbacks) == 1:
+            await self._deliver_all(subscription_ids[0], callbacks[0], events)
             return
 
-        # Create tasks for all callbacks
-        tasks = []
-        for sub_id, callback in self._subscriptions.items():
-            tasks.append(self._safe_callback(sub_id, callback, event))
+        await asyncio.gather(*[
+            self._deliver_all(sub_id, callback, events)
+            for sub_id, callback in zip(subscription_ids, callbacks)
+        ])
 
-        # Run all callbacks concurrently
-        if tasks:
-            await asyncio.gather(*tasks)
+    async def _deliver_all(
+        self,
+        subscription_id: str,
+        callback: SubscriptionCallback,
+        events: Sequence[EventEnvelope]
+    ) -> None:
+        """Deliver a batch of events to one subscriber, in order."""
+        for event in events:
+            await self._safe_callback(subscription_id, callback, event)
 
     async def _safe_callback(
         self,
@@ -163,17 +462,33 @@ class Observer:
         try:
             await callback(event)
         except Exception as e:
-            self._logger.error(f"Subscription {subscription_id} callback failed: {e}")
+            logger.error(f"Subscription {subscription_id} callback failed: {e}")
 
     # ========== Lifecycle ==========
 
     async def initialize(self) -> None:
         """Initialize the Observer and underlying store."""
         await self._store.initialize()
+        if self._batcher is not None:
+            self._batcher.start()
 
     async def close(self) -> None:
-        """Close the Observer and underlying store."""
+        """Close the Observer and underlying store.
+
+        Queued subscribers receive the events already queued for them first.
+        """
         self._subscriptions.clear()
+        self._rebuild_callbacks()
+        for queue, task, _ in self._subscriber_queues.values():
+            await queue.join()
+            task.cancel()
+        self._subscriber_queues.clear()
+        if self._batcher is not None:
+            await self._batcher.stop()
+        self._projection_cache.clear()
+        self._tips.clear()
+        if self._snapshots is not None:
+            self._snapshots.clear()
         await self._store.close()
 
     async def __aenter__(self):
@@ -2,7 +2,7 @@
 # Abstract Projection base class
 
 from abc import ABC, abstractmethod
-from typing import Any, Generic, List, TypeVar
+from typing import Any, AsyncIterable, Generic, Hashable, List, TypeVar
 
 from ..events.envelope import EventEnvelope
 
@@ -36,6 +36,23 @@ class Projection(ABC, Generic[T]):
         """
         pass
 
+    async def project_async(self, events: AsyncIterable[EventEnvelope]) -> T:
+        """Project a stream of events (e.g. from Observer.iter_events()).
+
+        The default collects the stream and calls project(); projections
+        that can fold events one at a time override this.
+        """
+        return self.project([event async for event in events])
+
+    def cache_key(self) -> Hashable:
+        """Key identifying this projection's output for a given event stream.
+
+        Projections of the same class with the same settings share a key,
+        so Observer.project() can reuse results across instances. Override
+        if a projection holds unhashable settings.
+        """
+        return (type(self), tuple(sorted(vars(self).items())))
+
     def __call__(self, events: List[EventEnvelope]) -> T:
         """Allow calling projection as a function."""
         return self.project(events)
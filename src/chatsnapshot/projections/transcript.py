@@ -2,11 +2,14 @@
 # TranscriptProjection - derives readable transcript from events
 
 from datetime import datetime
-from typing import List, Optional
+from typing import Callable, Dict, List, Optional
 
 from .base import Projection
 from ..events.envelope import EventEnvelope
-from ..events.types import EventType
+from ..events.types import EventType, EVENT_TYPE_VALUES
+
+# Formats one event given (event, timestamp prefix, agent name)
+EventFormatter = Callable[[EventEnvelope, str, str], Optional[str]]
 
 
 class TranscriptProjection(Projection[str]):
@@ -60,64 +63,112 @@ class TranscriptProjection(Projection[str]):
         lines.append("")
 
         # Process each event
+        handlers = self._handlers()
+        prefix = self._timestamp_prefixer()
+        append = lines.append
         for event in events:
-            line = self._format_event(event)
+            line = self._format_event(event, handlers, prefix)
             if line:
-                lines.append(line)
+                append(line)
 
         lines.append("")
         lines.append("=== End Transcript ===")
 
         return "\n".join(lines)
 
-    def _format_event(self, event: EventEnvelope) -> Optional[str]:
+    def _handlers(self) -> Dict[EventType, EventFormatter]:
+        """Build the event_type -> formatter table for the current settings."""
+        handlers: Dict[EventType, EventFormatter] = {
+            EventType.EXECUTION_MESSAGE: self._format_message,
+            EventType.EXECUTION_HANDOFF: self._format_handoff,
+            EventType.SYSTEM_WORKFLOW_STARTED: self._format_workflow_started,
+            EventType.SYSTEM_WORKFLOW_COMPLETED: self._format_workflow_completed,
+            EventType.EXECUTION_COMPLETED: self._format_execution_completed,
+        }
+        if self.include_tool_calls:
+            handlers[EventType.EXECUTION_TOOL_CALL] = self._format_tool_call
+            handlers[EventType.EXECUTION_TOOL_RESULT] = self._format_tool_result
+        return handlers
+
+    def _timestamp_prefixer(self) -> Callable[[datetime], str]:
+        """Return a function mapping an event timestamp to its "[...] " prefix.
+
+        Prefixes are memoized per whole second, since most events in a busy
+        stream share one; formats with a %f field are not cached.
+        """
+        if not self.include_timestamps:
+            return lambda timestamp: ""
+
+        fmt = self.timestamp_format
+        if "%f" in fmt:
+            return lambda timestamp: f"[{timestamp.strftime(fmt)}] "
+
+        cache: Dict[datetime, str] = {}
+
+        def prefix(timestamp: datetime) -> str:
+            key = timestamp.replace(microsecond=0)
+            formatted = cache.get(key)
+            if formatted is None:
+                formatted = cache[key] = f"[{timestamp.strftime(fmt)}] "
+            return formatted
+
+        return prefix
+
+    def _format_event(
+        self,
+        event: EventEnvelope,
+        handlers: Optional[Dict[EventType, EventFormatter]] = None,
+        prefix: Optional[Callable[[datetime], str]] = None
+    ) -> Optional[str]:
         """Format a single event as a transcript line."""
-        timestamp_str = ""
-        if self.include_timestamps:
-            timestamp_str = f"[{event.timestamp.strftime(self.timestamp_format)}] "
+        event_type = event.event_type
+        handler = (handlers or self._handlers()).get(event_type)
 
-        agent = event.source.agent_name or "System"
+        # Skip events that produce no line before formatting anything
+        if handler is None and not self.include_metadata:
+            return None
+        if event_type is EventType.EXECUTION_MESSAGE and not event.payload.get("content"):
+            return None
 
-        if event.event_type == EventType.EXECUTION_MESSAGE:
-            content = event.payload.get("content", "")
-            if not content:
-                return None
-            return f"{timestamp_str}{agent}: {content}"
+        timestamp_str = (prefix or self._timestamp_prefixer())(event.timestamp)
 
-        if event.event_type == EventType.EXECUTION_TOOL_CALL and self.include_tool_calls:
-            tool_name = event.payload.get("tool_name", "unknown")
-            args = event.payload.get("arguments", {})
-            return f"{timestamp_str}{agent} -> [TOOL: {tool_name}] {args}"
+        if handler is not None:
+            return handler(event, timestamp_str, event.source.agent_name or "System")
 
-        if event.event_type == EventType.EXECUTION_TOOL_RESULT and self.include_tool_calls:
-            tool_name = event.payload.get("tool_name", "unknown")
-            result = event.payload.get("result", "")
-            # Truncate long results
-            result_str = str(result)
-            if len(result_str) > 200:
-                result_str = result_str[:200] + "..."
-            return f"{timestamp_str}[TOOL RESULT: {tool_name}] {result_str}"
+        return f"{timestamp_str}[{EVENT_TYPE_VALUES[event_type]}] {event.payload}"
 
-        if event.event_type == EventType.EXECUTION_HANDOFF:
-            from_agent = event.payload.get("from_agent", "?")
-            to_agent = event.payload.get("to_agent", "?")
-            return f"{timestamp_str}[HANDOFF] {from_agent} -> {to_agent}"
+    def _format_message(self, event: EventEnvelope, timestamp_str: str, agent: str) -> Optional[str]:
+        return f"{timestamp_str}{agent}: {event.payload['content']}"
 
-        if event.event_type == EventType.SYSTEM_WORKFLOW_STARTED:
-            return f"{timestamp_str}[WORKFLOW STARTED]"
+    def _format_tool_call(self, event: EventEnvelope, timestamp_str: str, agent: str) -> Optional[str]:
+        tool_name = event.payload.get("tool_name", "unknown")
+        args = event.payload.get("arguments", {})
+        return f"{timestamp_str}{agent} -> [TOOL: {tool_name}] {args}"
 
-        if event.event_type == EventType.SYSTEM_WORKFLOW_COMPLETED:
-            reason = event.payload.get("reason", "")
-            return f"{timestamp_str}[WORKFLOW COMPLETED] {reason}"
+    def _format_tool_result(self, event: EventEnvelope, timestamp_str: str, agent: str) -> Optional[str]:
+        tool_name = event.payload.get("tool_name", "unknown")
+        result = event.payload.get("result", "")
+        # Truncate long results
+        result_str = str(result)
+        if len(result_str) > 200:
+            result_str = result_str[:200] + "..."
+        return f"{timestamp_str}[TOOL RESULT: {tool_name}] {result_str}"
 
-        if event.event_type == EventType.EXECUTION_COMPLETED:
-            reason = event.payload.get("reason", "")
-            return f"{timestamp_str}[EXECUTION COMPLETED] {reason}"
+    def _format_handoff(self, event: EventEnvelope, timestamp_str: str, agent: str) -> Optional[str]:
+        from_agent = event.payload.get("from_agent", "?")
+        to_agent = event.payload.get("to_agent", "?")
+        return f"{timestamp_str}[HANDOFF] {from_agent} -> {to_agent}"
 
-        if self.include_metadata:
-            return f"{timestamp_str}[{event.event_type.value}] {event.payload}"
+    def _format_workflow_started(self, event: EventEnvelope, timestamp_str: str, agent: str) -> Optional[str]:
+        return f"{timestamp_str}[WORKFLOW STARTED]"
 
-        return None
+    def _format_workflow_completed(self, event: EventEnvelope, timestamp_str: str, agent: str) -> Optional[str]:
+        reason = event.payload.get("reason", "")
+        return f"{timestamp_str}[WORKFLOW COMPLETED] {reason}"
+
+    def _format_execution_completed(self, event: EventEnvelope, timestamp_str: str, agent: str) -> Optional[str]:
+        reason = event.payload.get("reason", "")
+        return f"{timestamp_str}[EXECUTION COMPLETED] {reason}"
 
 
 class MarkdownTranscriptProjection(Projection[str]):
@@ -143,38 +194,55 @@ class MarkdownTranscriptProjection(Projection[str]):
         lines.append("")
 
         # Process each event
+        handlers = self._handlers()
         for event in events:
-            line = self._format_event(event)
+            line = self._format_event(event, handlers)
             if line:
                 lines.append(line)
                 lines.append("")
 
         return "\n".join(lines)
 
-    def _format_event(self, event: EventEnvelope) -> Optional[str]:
+    def _handlers(self) -> Dict[EventType, EventFormatter]:
+        """Build the event_type -> formatter table."""
+        return {
+            EventType.EXECUTION_MESSAGE: self._format_message,
+            EventType.EXECUTION_TOOL_CALL: self._format_tool_call,
+            EventType.EXECUTION_TOOL_RESULT: self._format_tool_result,
+            EventType.EXECUTION_HANDOFF: self._format_handoff,
+        }
+
+    def _format_event(
+        self,
+        event: EventEnvelope,
+        handlers: Optional[Dict[EventType, EventFormatter]] = None
+    ) -> Optional[str]:
         """Format a single event as Markdown."""
+        handler = (handlers or self._handlers()).get(event.event_type)
+        if handler is None:
+            return None
+
         agent = event.source.agent_name or "System"
         timestamp = event.timestamp.strftime("%H:%M:%S")
-
-        if event.event_type == EventType.EXECUTION_MESSAGE:
-            content = event.payload.get("content", "")
-            if not content:
-                return None
-            return f"**{agent}** ({timestamp}):\n> {content}"
-
-        if event.event_type == EventType.EXECUTION_TOOL_CALL:
-            tool_name = event.payload.get("tool_name", "unknown")
-            args = event.payload.get("arguments", {})
-            return f"**{agent}** ({timestamp}) called `{tool_name}`:\n```json\n{args}\n```"
-
-        if event.event_type == EventType.EXECUTION_TOOL_RESULT:
-            tool_name = event.payload.get("tool_name", "unknown")
-            result = event.payload.get("result", "")
-            return f"**Tool Result** (`{tool_name}`):\n```\n{result}\n```"
-
-        if event.event_type == EventType.EXECUTION_HANDOFF:
-            from_agent = event.payload.get("from_agent", "?")
-            to_agent = event.payload.get("to_agent", "?")
-            return f"*Handoff: {from_agent} → {to_agent}*"
-
-        return None
+        return handler(event, timestamp, agent)
+
+    def _format_message(self, event: EventEnvelope, timestamp: str, agent: str) -> Optional[str]:
+        content = event.payload.get("content", "")
+        if not content:
+            return None
+        return f"**{agent}** ({timestamp}):\n> {content}"
+
+    def _format_tool_call(self, event: EventEnvelope, timestamp: str, agent: str) -> Optional[str]:
+        tool_name = event.payload.get("tool_name", "unknown")
+        args = event.payload.get("arguments", {})
+        return f"**{agent}** ({timestamp}) called `{tool_name}`:\n```json\n{args}\n```"
+
+    def _format_tool_result(self, event: EventEnvelope, timestamp: str, agent: str) -> Optional[str]:
+        tool_name = event.payload.get("tool_name", "unknown")
+        result = event.payload.get("result", "")
+        return f"**Tool Result** (`{tool_name}`):\n```\n{result}\n```"
+
+    def _format_handoff(self, event: EventEnvelope, timestamp: str, agent: str) -> Optional[str]:
+        from_agent = event.payload.get("from_agent", "?")
+        to_agent = event.payload.get("to_agent", "?")
+        return f"*Handoff: {from_agent} → {to_agent}*"
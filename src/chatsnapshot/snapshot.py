@@ -1,18 +1,56 @@
 # /src/chatsnapshot/snapshot.py
 # ChatSnapshot data model - projection output format
 
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Set, Union
 
+from .events.envelope import EventEnvelope, json_dumps, json_loads, parse_timestamp
+from .events.types import EventType, EVENT_TYPE_VALUES
 
-@dataclass
+# Event types that become entries in ChatSnapshot.messages
+MESSAGE_EVENT_TYPES = frozenset({
+    EventType.EXECUTION_MESSAGE,
+    EventType.EXECUTION_TOOL_CALL,
+    EventType.EXECUTION_TOOL_RESULT,
+})
+
+# Event types that mark a chat as terminated
+TERMINAL_EVENT_TYPES = frozenset({
+    EventType.EXECUTION_COMPLETED,
+    EventType.SYSTEM_WORKFLOW_COMPLETED,
+})
+
+
+def _naive_deepcopy(value: Any) -> Any:
+    """Deep-copy JSON-shaped data (dicts and lists); anything else is shared.
+
+    Much cheaper than copy.deepcopy for the message/state trees a snapshot
+    holds, since it skips the memo and the generic type dispatch. Only
+    exact dict/list instances are copied.
+    """
+    value_type = type(value)
+    if value_type is dict:
+        return {k: _naive_deepcopy(v) for k, v in value.items()}
+    if value_type is list:
+        return [_naive_deepcopy(v) for v in value]
+    return value
+
+
+def _shared(value: Any) -> Any:
+    """Return value as is (the no-copy counterpart of _naive_deepcopy)."""
+    return value
+
+
+@dataclass(slots=True)
 class ChatSnapshot:
     """Represents a complete snapshot of a chat state.
 
     ChatSnapshot is now a projection output - derived from an event stream
     by the SnapshotProjection class. It maintains backwards compatibility
     with the original format while being generated from events.
+
+    Slotted, since the Observer can keep one live snapshot per correlation.
     """
     chat_id: str
     chat_type: str  # "direct", "group", "nested"
@@ -34,15 +72,143 @@ class ChatSnapshot:
     termination_reason: Optional[str] = None
     is_terminated: bool = False
 
+    # Agents seen by apply(); decides chat_type, not serialized
+    _agents: Set[str] = field(default_factory=set, init=False, repr=False, compare=False)
+
+    @classmethod
+    def from_event(cls, event: EventEnvelope) -> 'ChatSnapshot':
+        """Create a snapshot from the first event of a stream."""
+        snapshot = cls(
+            chat_id=event.correlation_id,
+            chat_type="direct",
+            timestamp=event.timestamp,
+            messages=[]
+        )
+        snapshot.apply(event)
+        return snapshot
+
+    def apply(self, event: EventEnvelope) -> None:
+        """Fold one event into the snapshot (O(1) per event).
+
+        Applying a stream's events in order produces the same snapshot as
+        SnapshotProjection.project() on the whole stream.
+        """
+        event_type = event.event_type
+        payload = event.payload
+        agent_name = event.source.agent_name
+
+        # Agents involved determine the chat type
+        agents = self._agents
+        for name in (agent_name, payload.get("agent_name"), payload.get("name")):
+            if name:
+                agents.add(name)
+        self.chat_type = "group" if len(agents) > 2 else "direct"
+
+        if event_type in MESSAGE_EVENT_TYPES:
+            msg = {
+                **payload,
+                "_event_id": event.event_id,
+                "_event_type": EVENT_TYPE_VALUES[event_type],
+                "_timestamp": event.timestamp.isoformat(),
+            }
+            # Ensure name is set
+            if agent_name and "name" not in msg:
+                msg["name"] = agent_name
+            self.messages.append(msg)
+
+            if event_type == EventType.EXECUTION_MESSAGE:
+                self.last_speaker = agent_name or payload.get("name")
+                self.round_count += 1
+
+        elif event_type in TERMINAL_EVENT_TYPES:
+            self.termination_reason = payload.get("reason")
+            self.is_terminated = True
+
+        elif event_type == EventType.EXECUTION_STATE_CHANGE:
+            if "context_variables" in payload:
+                self.context_variables.update(payload["context_variables"])
+
+        if agent_name:
+            state = self.agent_states.get(agent_name)
+            if state is None:
+                state = self.agent_states[agent_name] = {"name": agent_name}
+            # Update state from payload if it contains agent config
+            if "system_message" in payload:
+                state["system_message"] = payload["system_message"]
+            if "llm_config" in payload:
+                state["llm_config"] = payload["llm_config"]
+
+        metadata = self.metadata
+        timestamp = event.timestamp.isoformat()
+        if "first_event" not in metadata:
+            # Same key order as a projection of the whole stream
+            metadata["event_count"] = 0
+            metadata["first_event"] = event.event_id
+            metadata["last_event"] = event.event_id
+            metadata["start_time"] = timestamp
+            metadata["end_time"] = timestamp
+        metadata["event_count"] += 1
+        metadata["last_event"] = event.event_id
+        metadata["end_time"] = timestamp
+        self.timestamp = event.timestamp
+
     def to_dict(self) -> Dict[str, Any]:
-        """Serialize to JSON-compatible dictionary."""
-        data = asdict(self)
-        data['timestamp'] = self.timestamp.isoformat()
-        return data
+        """Serialize to JSON-compatible dictionary.
+
+        Containers are copied, so the result can be modified freely.
+        """
+        return self._as_dict(_naive_deepcopy)
+
+    def to_json_bytes(self) -> bytes:
+        """Serialize to compact JSON bytes.
+
+        Encodes the fields directly, without the defensive copies to_dict()
+        makes.
+        """
+        return json_dumps(self._as_dict(_shared))
+
+    def _as_dict(self, copy: Callable[[Any], Any]) -> Dict[str, Any]:
+        """Build the serialized form, passing each container through copy."""
+        return {
+            "chat_id": self.chat_id,
+            "chat_type": self.chat_type,
+            "timestamp": self.timestamp.isoformat(),
+            "messages": copy(self.messages),
+            "metadata": copy(self.metadata),
+            "agent_states": copy(self.agent_states),
+            "context_variables": copy(self.context_variables),
+            "speaker_selection_method": self.speaker_selection_method,
+            "max_round": self.max_round,
+            "admin_name": self.admin_name,
+            "speaker_transitions": copy(self.speaker_transitions),
+            "last_speaker": self.last_speaker,
+            "round_count": self.round_count,
+            "termination_reason": self.termination_reason,
+            "is_terminated": self.is_terminated,
+        }
+
+    @classmethod
+    def from_json(cls, data: Union[bytes, str]) -> 'ChatSnapshot':
+        """Deserialize from JSON bytes or str."""
+        return cls.from_dict(json_loads(data))
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'ChatSnapshot':
-        """Deserialize from dictionary."""
+        """Deserialize from dictionary.
+
+        The timestamp may be an ISO 8601 string (as written by to_dict) or
+        integer microseconds since the epoch. The agents apply() tracks are
+        recovered from agent_states and message names, so applying further
+        events keeps the chat type.
+        """
         data = dict(data)  # Copy to avoid mutating input
-        data['timestamp'] = datetime.fromisoformat(data['timestamp'])
-        return cls(**data)
+        data['timestamp'] = parse_timestamp(data['timestamp'])
+        snapshot = cls(**data)
+        agents = snapshot._agents
+        agents.update(snapshot.agent_states)
+        for msg in snapshot.messages:
+            for key in ("agent_name", "name"):
+                name = msg.get(key)
+                if name:
+                    agents.add(name)
+        return snapshot
@@ -1,11 +1,23 @@
 # /src/chatsnapshot/storage/__init__.py
 # Event storage implementations
 
+import importlib
+from typing import TYPE_CHECKING
+
 from .base import EventStore
 from .memory_store import MemoryEventStore
-from .json_store import JSONEventStore
-from .sqlite_store import SQLiteEventStore
-from .mongodb_store import MongoDBEventStore
+
+if TYPE_CHECKING:
+    from .json_store import JSONEventStore
+    from .sqlite_store import SQLiteEventStore
+    from .mongodb_store import MongoDBEventStore
+
+# Backends that pull in optional drivers are imported on first use
+_LAZY_IMPORTS = {
+    "JSONEventStore": ".json_store",
+    "SQLiteEventStore": ".sqlite_store",
+    "MongoDBEventStore": ".mongodb_store",
+}
 
 __all__ = [
     "EventStore",
@@ -14,3 +26,17 @@ __all__ = [
     "SQLiteEventStore",
     "MongoDBEventStore",
 ]
+
+
+def __getattr__(name: str):
+    """Import storage backends on first access (PEP 562)."""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
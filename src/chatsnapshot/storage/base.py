@@ -3,11 +3,16 @@
 
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import List, Optional
+from operator import attrgetter
+from typing import AsyncIterator, List, Optional, Sequence
 
 from ..events.envelope import EventEnvelope
 from ..events.types import EventType
 
+# Sort key for ordering events by timestamp. Events are appended in roughly
+# chronological order, so sorted() (Timsort) mostly just verifies one run.
+BY_TIMESTAMP = attrgetter("timestamp")
+
 
 class EventStore(ABC):
     """Abstract base class for async event storage.
@@ -16,6 +21,10 @@ class EventStore(ABC):
     querying by correlation_id, event_type, and timestamp.
     """
 
+    # Whether a failed append_many() is guaranteed to have stored none of
+    # its events (lets Observer's write batching retry submissions singly)
+    atomic_append_many: bool = False
+
     @abstractmethod
     async def initialize(self) -> None:
         """Initialize the storage (create tables, files, etc.)."""
@@ -31,6 +40,15 @@ class EventStore(ABC):
         """Append an event to the store (append-only)."""
         pass
 
+    async def append_many(self, events: Sequence[EventEnvelope]) -> None:
+        """Append several events in order.
+
+        Stores that support bulk writes override this to persist the whole
+        batch in one operation; the default appends one at a time.
+        """
+        for event in events:
+            await self.append(event)
+
     @abstractmethod
     async def query(self, correlation_id: str) -> List[EventEnvelope]:
         """Query events by correlation_id, ordered by timestamp."""
@@ -56,6 +74,29 @@ class EventStore(ABC):
         """Get total event count."""
         pass
 
+    # Streaming variants of the queries above. The defaults load the full
+    # list; stores that can read incrementally override them.
+
+    async def iter_query(self, correlation_id: str) -> AsyncIterator[EventEnvelope]:
+        """Stream events by correlation_id, ordered by timestamp."""
+        for event in await self.query(correlation_id):
+            yield event
+
+    async def iter_by_type(self, event_type: EventType) -> AsyncIterator[EventEnvelope]:
+        """Stream events by event_type, ordered by timestamp."""
+        for event in await self.query_by_type(event_type):
+            yield event
+
+    async def iter_since(self, timestamp: datetime) -> AsyncIterator[EventEnvelope]:
+        """Stream events since a given timestamp, ordered by timestamp."""
+        for event in await self.query_since(timestamp):
+            yield event
+
+    async def iter_all(self) -> AsyncIterator[EventEnvelope]:
+        """Stream all events, ordered by timestamp."""
+        for event in await self.get_all():
+            yield event
+
     async def __aenter__(self):
         """Async context manager entry."""
         await self.initialize()
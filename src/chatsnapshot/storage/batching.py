@@ -0,0 +1,159 @@
+# Write coalescing for EventStore implementations
+
+import asyncio
+from typing import Any, Awaitable, Callable, Generic, List, Optional, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# Type alias for the flush callback: receives one coalesced batch
+FlushCallback = Callable[[List[Any]], Awaitable[None]]
+
+
+class WriteBatcher(Generic[T]):
+    """Coalesces concurrent writes into batches flushed by one background task.
+
+    Writers call submit()/submit_many() and wait until their items have been
+    flushed. While a flush is in progress, new items accumulate in the queue
+    and are written together by the next flush, so N concurrent writers cost
+    one transaction instead of N.
+
+    The flusher never delays a lone writer unless batch_timeout_ms is set:
+    it drains whatever is already queued (up to batch_size) and flushes.
+
+    When a combined batch fails, each submission is retried on its own so
+    one bad write doesn't fail unrelated writers. That is only safe when a
+    failed flush wrote nothing; pass atomic=False for flush callbacks that
+    can partially succeed, and every writer in the batch gets the error.
+    """
+
+    def __init__(
+        self,
+        flush: FlushCallback,
+        batch_size: int = 50,
+        batch_timeout_ms: float = 0.0,
+        atomic: bool = True
+    ):
+        """Initialize the batcher.
+
+        Args:
+            flush: Async callable that persists a batch (e.g. one executemany + commit)
+            batch_size: Maximum number of items per flush
+            batch_timeout_ms: How long to linger for more items after the first
+                one arrives (0 = flush immediately with whatever is queued)
+            atomic: Whether a failed flush is guaranteed to have written
+                nothing (enables per-submission retries)
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self._flush = flush
+        self._batch_size = batch_size
+        self._batch_timeout = batch_timeout_ms / 1000
+        self._atomic = atomic
+        self._queue: "asyncio.Queue[Tuple[Sequence[T], asyncio.Future]]" = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the background flusher is running."""
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start the background flusher (requires a running event loop)."""
+        if not self.running:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Flush everything still queued, then stop the background flusher."""
+        if self._task is None:
+            return
+        if not self._task.done():
+            await self._queue.join()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def submit(self, item: T) -> None:
+        """Queue a single item and wait until it has been flushed."""
+        await self.submit_many((item,))
+
+    async def submit_many(self, items: Sequence[T]) -> None:
+        """Queue items and wait until all of them have been flushed.
+
+        Items submitted together are always flushed in the same batch.
+        """
+        if not items:
+            return
+        if not self.running:
+            raise RuntimeError("WriteBatcher is not running; call start() first")
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((items, future))
+        await future
+
+    async def _run(self) -> None:
+        """Flusher loop."""
+        while True:
+            await self._flush_next()
+
+    async def _flush_next(self) -> None:
+        """Collect one batch from the queue and flush it."""
+        pending = [await self._queue.get()]
+        size = len(pending[0][0])
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._batch_timeout
+        while size < self._batch_size:
+            try:
+                entry = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    entry = await asyncio.wait_for(self._queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+            pending.append(entry)
+            size += len(entry[0])
+
+        try:
+            if len(pending) == 1:
+                await self._flush_entry(*pending[0])
+            else:
+                batch: List[T] = []
+                for items, _ in pending:
+                    batch.extend(items)
+                try:
+                    await self._flush(batch)
+                except Exception as e:
+                    if self._atomic:
+                        # Nothing was written: retry each submission on its
+                        # own so one bad write doesn't fail unrelated writers.
+                        for items, future in pending:
+                            await self._flush_entry(items, future)
+                    else:
+                        # Part of the batch may be stored; retrying would
+                        # write it twice, so report the failure to everyone.
+                        for _, future in pending:
+                            if not future.done():
+                                future.set_exception(e)
+                else:
+                    for _, future in pending:
+                        if not future.done():
+                            future.set_result(None)
+        finally:
+            for _ in pending:
+                self._queue.task_done()
+
+    async def _flush_entry(self, items: Sequence[T], future: asyncio.Future) -> None:
+        """Flush a single submission and resolve its future."""
+        try:
+            await self._flush(list(items))
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+        else:
+            if not future.done():
+                future.set_result(None)
@@ -1,10 +1,11 @@
 # /src/chatsnapshot/storage/json_store.py
 # JSON file-based EventStore implementation (async with aiofiles)
 
-import json
+import asyncio
+import os
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Sequence, Set
 
 try:
     import aiofiles
@@ -14,6 +15,7 @@ except ImportError:
     HAS_AIOFILES = False
 
 from .base import EventStore
+from .memory_store import MemoryEventStore
 from ..events.envelope import EventEnvelope
 from ..events.types import EventType
 
@@ -24,76 +26,171 @@ class JSONEventStore(EventStore):
     Each event is stored as a single JSON line in the events file.
     This format supports efficient appending and streaming reads.
 
+    Parsed events are cached in an indexed MemoryEventStore along with the
+    file offset consumed so far; each query only reads and decodes lines
+    appended since the previous one, and events written through this store
+    are indexed directly without being read back.
+
+    The events file is held open between writes. By default every append is
+    written and flushed to the OS before it returns; with buffer_size > 1,
+    appends are collected and written together once that many are pending,
+    or by a timer flush_interval_ms after the first of them was buffered.
+    Queries and close() flush first, and flush() can be called for durability at any
+    point. Pass fsync=True to also force each write to disk.
+
     Requires: aiofiles (pip install aiofiles)
     """
 
-    def __init__(self, storage_dir: str = "./chatsnapshot_events"):
+    def __init__(
+        self,
+        storage_dir: str = "./chatsnapshot_events",
+        fsync: bool = False,
+        buffer_size: int = 1,
+        flush_interval_ms: float = 50.0
+    ):
+        """Initialize the store.
+
+        Args:
+            storage_dir: Directory holding the events.jsonl file
+            fsync: Whether to fsync the file after every write
+            buffer_size: Pending events that trigger a write (1 = write every append)
+            flush_interval_ms: Write pending events at most this long after
+                they were buffered (only used with buffer_size > 1)
+        """
         if not HAS_AIOFILES:
             raise ImportError("aiofiles is required for JSONEventStore. Install with: pip install aiofiles")
         self._storage_dir = Path(storage_dir)
         self._events_file = self._storage_dir / "events.jsonl"
+        self._fsync = fsync
+        self._buffer_size = max(1, buffer_size)
+        self._flush_interval = flush_interval_ms / 1000
+        # Pending events and their encoded lines (encoded on append, so an
+        # unserializable event fails its own append and not a later flush)
+        self._buffer: List[EventEnvelope] = []
+        self._buffer_lines: List[bytes] = []
+        # Timer that flushes a partially filled buffer, and the flushes it started
+        self._flush_timer: Optional[asyncio.TimerHandle] = None
+        self._flush_tasks: Set[asyncio.Task] = set()
+        self._file = None
+        self._cache = MemoryEventStore()
+        self._offset = 0
+        self._lock = asyncio.Lock()
         self._initialized = False
 
     async def initialize(self) -> None:
-        """Create storage directory if it doesn't exist."""
+        """Create storage directory if it doesn't exist and open the events file."""
         await aiofiles.os.makedirs(self._storage_dir, exist_ok=True)
-        if not await aiofiles.os.path.exists(self._events_file):
-            async with aiofiles.open(self._events_file, "w") as f:
-                pass  # Create empty file
+        if self._file is None:
+            self._file = await aiofiles.open(self._events_file, "ab")
         self._initialized = True
 
     async def close(self) -> None:
-        """Close the store (no-op for file-based storage)."""
-        pass
+        """Write any buffered events and close the events file."""
+        if self._flush_tasks:
+            await asyncio.gather(*self._flush_tasks)
+        await self.flush()
+        if self._file is not None:
+            await self._file.close()
+            self._file = None
 
     async def append(self, event: EventEnvelope) -> None:
         """Append an event as a JSON line."""
-        async with aiofiles.open(self._events_file, "a") as f:
-            await f.write(json.dumps(event.to_dict()) + "\n")
-
-    async def _load_all_events(self) -> List[EventEnvelope]:
-        """Load all events from the JSON Lines file."""
-        events = []
-        try:
-            async with aiofiles.open(self._events_file, "r") as f:
-                async for line in f:
-                    line = line.strip()
-                    if line:
-                        events.append(EventEnvelope.from_dict(json.loads(line)))
-        except FileNotFoundError:
-            pass
-        return events
+        await self._append((event,))
+
+    async def append_many(self, events: Sequence[EventEnvelope]) -> None:
+        """Append several events with a single write."""
+        if not events:
+            return
+        await self._append(events)
+
+    async def _append(self, events: Sequence[EventEnvelope]) -> None:
+        """Buffer events and write them out once the buffer is full or stale."""
+        lines = [event.to_json_bytes() + b"\n" for event in events]
+        self._buffer.extend(events)
+        self._buffer_lines.extend(lines)
+        if len(self._buffer) >= self._buffer_size:
+            await self.flush()
+        elif self._flush_timer is None:
+            self._flush_timer = asyncio.get_running_loop().call_later(
+                self._flush_interval, self._flush_in_background
+            )
+
+    def _flush_in_background(self) -> None:
+        """Timer callback: flush the buffer in a task (awaited by close())."""
+        self._flush_timer = None
+        task = asyncio.get_running_loop().create_task(self.flush())
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    async def flush(self) -> None:
+        """Write all buffered events to the events file."""
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        if not self._buffer:
+            return
+        events, self._buffer = self._buffer, []
+        lines, self._buffer_lines = self._buffer_lines, []
+        await self._write(b"".join(lines), events)
+
+    async def _write(self, data: bytes, events: Sequence[EventEnvelope]) -> None:
+        """Append raw bytes to the events file (and fsync if configured).
+
+        When the cache is caught up with the file, the written events are
+        indexed directly and the offset moves past them.
+        """
+        async with self._lock:
+            if self._file is None:
+                await self.initialize()
+            f = self._file
+            caught_up = await f.seek(0, os.SEEK_END) == self._offset
+            await f.write(data)
+            await f.flush()
+            if self._fsync:
+                await asyncio.to_thread(os.fsync, f.fileno())
+            if caught_up:
+                self._offset += len(data)
+                await self._cache.append_many(events)
+
+    async def _refresh(self) -> MemoryEventStore:
+        """Write pending events, then parse lines appended since the last read."""
+        await self.flush()
+        async with self._lock:
+            try:
+                async with aiofiles.open(self._events_file, "rb") as f:
+                    await f.seek(self._offset)
+                    data = await f.read()
+            except FileNotFoundError:
+                return self._cache
+
+            # Leave a trailing partial line for the next refresh
+            end = data.rfind(b"\n") + 1
+            if end:
+                self._offset += end
+                from_json = EventEnvelope.from_json
+                await self._cache.append_many([
+                    from_json(line)
+                    for line in data[:end].split(b"\n")
+                    if line and not line.isspace()
+                ])
+        return self._cache
 
     async def query(self, correlation_id: str) -> List[EventEnvelope]:
         """Query events by correlation_id."""
-        events = await self._load_all_events()
-        return sorted(
-            [e for e in events if e.correlation_id == correlation_id],
-            key=lambda e: e.timestamp
-        )
+        return await (await self._refresh()).query(correlation_id)
 
     async def query_by_type(self, event_type: EventType) -> List[EventEnvelope]:
         """Query events by event_type."""
-        events = await self._load_all_events()
-        return sorted(
-            [e for e in events if e.event_type == event_type],
-            key=lambda e: e.timestamp
-        )
+        return await (await self._refresh()).query_by_type(event_type)
 
     async def query_since(self, timestamp: datetime) -> List[EventEnvelope]:
         """Query events since a given timestamp."""
-        events = await self._load_all_events()
-        return sorted(
-            [e for e in events if e.timestamp >= timestamp],
-            key=lambda e: e.timestamp
-        )
+        return await (await self._refresh()).query_since(timestamp)
 
     async def get_all(self) -> List[EventEnvelope]:
         """Get all events."""
-        events = await self._load_all_events()
-        return sorted(events, key=lambda e: e.timestamp)
+        return await (await self._refresh()).get_all()
 
     async def count(self) -> int:
         """Get total event count."""
-        events = await self._load_all_events()
-        return len(events)
+        return await (await self._refresh()).count()
@@ -1,10 +1,12 @@
 # /src/chatsnapshot/storage/memory_store.py
 # In-memory EventStore implementation (async)
 
+from bisect import bisect_left, insort
+from collections import defaultdict
 from datetime import datetime
-from typing import List
+from typing import Dict, List, Sequence
 
-from .base import EventStore
+from .base import EventStore, BY_TIMESTAMP
 from ..events.envelope import EventEnvelope
 from ..events.types import EventType
 
@@ -14,10 +16,15 @@ class MemoryEventStore(EventStore):
 
     Events are stored in a list and lost when the process exits.
     Thread-safe for single-threaded async contexts.
+
+    The event list and the per-correlation / per-type indexes are kept
+    sorted by timestamp as events arrive, so queries never re-sort.
     """
 
     def __init__(self):
         self._events: List[EventEnvelope] = []
+        self._by_correlation: Dict[str, List[EventEnvelope]] = defaultdict(list)
+        self._by_type: Dict[EventType, List[EventEnvelope]] = defaultdict(list)
         self._initialized = False
 
     async def initialize(self) -> None:
@@ -30,32 +37,42 @@ class MemoryEventStore(EventStore):
 
     async def append(self, event: EventEnvelope) -> None:
         """Append an event to the in-memory list."""
-        self._events.append(event)
+        self._insert(event)
+
+    async def append_many(self, events: Sequence[EventEnvelope]) -> None:
+        """Append several events to the in-memory list."""
+        for event in events:
+            self._insert(event)
+
+    def _insert(self, event: EventEnvelope) -> None:
+        """Add an event to the time-ordered list and both indexes."""
+        for bucket in (
+            self._events,
+            self._by_correlation[event.correlation_id],
+            self._by_type[event.event_type],
+        ):
+            # Events almost always arrive in time order; only bisect when not
+            if bucket and event.timestamp < bucket[-1].timestamp:
+                insort(bucket, event, key=BY_TIMESTAMP)
+            else:
+                bucket.append(event)
 
     async def query(self, correlation_id: str) -> List[EventEnvelope]:
         """Query events by correlation_id."""
-        return sorted(
-            [e for e in self._events if e.correlation_id == correlation_id],
-            key=lambda e: e.timestamp
-        )
+        return list(self._by_correlation.get(correlation_id, ()))
 
     async def query_by_type(self, event_type: EventType) -> List[EventEnvelope]:
         """Query events by event_type."""
-        return sorted(
-            [e for e in self._events if e.event_type == event_type],
-            key=lambda e: e.timestamp
-        )
+        return list(self._by_type.get(event_type, ()))
 
     async def query_since(self, timestamp: datetime) -> List[EventEnvelope]:
         """Query events since a given timestamp."""
-        return sorted(
-            [e for e in self._events if e.timestamp >= timestamp],
-            key=lambda e: e.timestamp
-        )
+        start = bisect_left(self._events, timestamp, key=BY_TIMESTAMP)
+        return self._events[start:]
 
     async def get_all(self) -> List[EventEnvelope]:
         """Get all events."""
-        return sorted(self._events, key=lambda e: e.timestamp)
+        return list(self._events)
 
     async def count(self) -> int:
         """Get total event count."""
@@ -64,3 +81,5 @@ class MemoryEventStore(EventStore):
     def clear(self) -> None:
         """Clear all events (for testing)."""
         self._events.clear()
+        self._by_correlation.clear()
+        self._by_type.clear()
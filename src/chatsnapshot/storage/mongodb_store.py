@@ -1,11 +1,14 @@
 # /src/chatsnapshot/storage/mongodb_store.py
 # MongoDB-based EventStore implementation (async with Motor)
 
+import asyncio
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 try:
     from motor.motor_asyncio import AsyncIOMotorClient
+    from pymongo import ASCENDING, IndexModel, WriteConcern
+    from pymongo.errors import OperationFailure
     HAS_MOTOR = True
 except ImportError:
     HAS_MOTOR = False
@@ -15,14 +18,63 @@ from ..events.envelope import EventEnvelope, EventSource
 from ..events.types import EventType
 
 
+# Single-field indexes created by earlier versions; each is a prefix of one
+# of the compound indexes below and only costs writes now. Dropped on
+# initialize() only with drop_legacy_indexes=True.
+LEGACY_INDEXES = ("correlation_id_1", "event_type_1")
+
+# Documents fetched per round-trip by query methods
+QUERY_BATCH_SIZE = 1000
+# Queries leave out Mongo's _id, which EventEnvelope has no field for
+NO_ID_PROJECTION = {"_id": 0}
+
+# Shared Motor clients: (connection_string, max_pool_size, event loop) -> [client, reference count].
+# Motor clients are bound to the loop they are first used on, so sharing is per loop.
+_CLIENT_CACHE: Dict[Tuple[str, int, Any], list] = {}
+
+
+def _acquire_client(connection_string: str, max_pool_size: int) -> Tuple[Tuple[str, int, Any], "AsyncIOMotorClient"]:
+    """Get the shared client for a connection string and pool size, creating it if needed."""
+    key = (connection_string, max_pool_size, asyncio.get_running_loop())
+    entry = _CLIENT_CACHE.get(key)
+    if entry is None:
+        entry = [AsyncIOMotorClient(connection_string, maxPoolSize=max_pool_size), 0]
+        _CLIENT_CACHE[key] = entry
+    entry[1] += 1
+    return key, entry[0]
+
+
+def _release_client(key: Tuple[str, int, Any]) -> None:
+    """Drop one reference to a shared client, closing it when unused."""
+    entry = _CLIENT_CACHE.get(key)
+    if entry is None:
+        return
+    entry[1] -= 1
+    if entry[1] <= 0:
+        del _CLIENT_CACHE[key]
+        entry[0].close()
+
+
 class MongoDBEventStore(EventStore):
     """MongoDB-based event store using Motor (async driver).
 
     Stores events in a collection with indexes on:
-    - correlation_id
-    - event_type
+    - event_id (unique)
+    - (correlation_id, timestamp)
+    - (event_type, timestamp)
     - timestamp
 
+    Stores with the same connection string and pool size share one client
+    (and so one connection pool) per event loop; the client is closed when
+    the last store using it is closed. An application that already has a
+    client can pass it in instead; the store then uses it as is and never
+    closes it.
+
+    fast_insert=True sends appends with an unacknowledged write concern
+    (w=0): append() returns as soon as the insert is on the wire, so
+    throughput is much higher, but failed inserts (duplicate event_id,
+    validation errors, a primary stepping down) are silently lost.
+
     Requires: motor (pip install motor)
     """
 
@@ -30,77 +82,133 @@ class MongoDBEventStore(EventStore):
         self,
         connection_string: str = "mongodb://localhost:27017",
         database_name: str = "chatsnapshot",
-        collection_name: str = "events"
+        collection_name: str = "events",
+        max_pool_size: int = 100,
+        client: Optional["AsyncIOMotorClient"] = None,
+        fast_insert: bool = False,
+        drop_legacy_indexes: bool = False
     ):
+        """Initialize the store.
+
+        Args:
+            connection_string: MongoDB connection URI
+            database_name: Database holding the events collection
+            collection_name: Name of the events collection
+            max_pool_size: Connection pool size of the shared client
+            client: Existing client to use instead of the shared one (not
+                closed by the store)
+            fast_insert: Append with unacknowledged (w=0) writes
+            drop_legacy_indexes: Drop the single-field indexes earlier
+                versions created (see LEGACY_INDEXES) if present; a one-time
+                migration, leave off afterwards
+        """
         if not HAS_MOTOR:
             raise ImportError("motor is required for MongoDBEventStore. Install with: pip install motor")
         self._connection_string = connection_string
         self._database_name = database_name
         self._collection_name = collection_name
+        self._max_pool_size = max_pool_size
+        self._external_client = client
+        self._fast_insert = fast_insert
+        self._drop_legacy_indexes = drop_legacy_indexes
+        self._client_key: Optional[Tuple[str, int, Any]] = None
         self._client = None
         self._db = None
         self._collection = None
+        self._write_collection = None
 
     async def initialize(self) -> None:
         """Connect to MongoDB and create indexes."""
-        self._client = AsyncIOMotorClient(self._connection_string)
+        if self._external_client is not None:
+            self._client = self._external_client
+        else:
+            self._client_key, self._client = _acquire_client(self._connection_string, self._max_pool_size)
         self._db = self._client[self._database_name]
         self._collection = self._db[self._collection_name]
-
-        # Create indexes
-        await self._collection.create_index("event_id", unique=True)
-        await self._collection.create_index("correlation_id")
-        await self._collection.create_index("event_type")
-        await self._collection.create_index("timestamp")
+        self._write_collection = (
+            self._collection.with_options(write_concern=WriteConcern(w=0))
+            if self._fast_insert else self._collection
+        )
+
+        # Equality field first, then the sort field, so queries need no in-memory sort
+        await self._collection.create_indexes([
+            IndexModel([("event_id", ASCENDING)], unique=True),
+            IndexModel([("correlation_id", ASCENDING), ("timestamp", ASCENDING)]),
+            IndexModel([("event_type", ASCENDING), ("timestamp", ASCENDING)]),
+            IndexModel([("timestamp", ASCENDING)]),
+        ])
+        if self._drop_legacy_indexes:
+            existing = await self._collection.index_information()
+            for name in LEGACY_INDEXES:
+                if name in existing:
+                    try:
+                        await self._collection.drop_index(name)
+                    except OperationFailure:
+                        pass  # Dropped concurrently
 
     async def close(self) -> None:
-        """Close the MongoDB connection."""
+        """Release the (shared) MongoDB client."""
         if self._client:
-            self._client.close()
+            if self._client_key is not None:
+                _release_client(self._client_key)
+            self._client_key = None
             self._client = None
             self._db = None
             self._collection = None
+            self._write_collection = None
 
     async def append(self, event: EventEnvelope) -> None:
         """Append an event to the collection."""
         doc = event.to_dict()
-        await self._collection.insert_one(doc)
+        await self._write_collection.insert_one(doc)
+
+    async def append_many(self, events: Sequence[EventEnvelope]) -> None:
+        """Append several events with one unordered bulk insert.
+
+        The driver splits the insert into server-sized batches. Being
+        unordered, every document is attempted even if some fail (e.g. a
+        duplicate event_id); the failures are then raised together as a
+        BulkWriteError.
+        """
+        if not events:
+            return
+        await self._write_collection.insert_many(
+            [event.to_dict() for event in events], ordered=False
+        )
 
     def _doc_to_event(self, doc: dict) -> EventEnvelope:
-        """Convert a MongoDB document to an EventEnvelope."""
-        doc.pop("_id", None)  # Remove MongoDB's _id field
+        """Convert a MongoDB document (fetched without _id) to an EventEnvelope."""
         return EventEnvelope.from_dict(doc)
 
-    async def query(self, correlation_id: str) -> List[EventEnvelope]:
-        """Query events by correlation_id."""
+    async def _find(self, query: Dict[str, Any]) -> List[EventEnvelope]:
+        """Run a timestamp-ordered find, converting documents as batches arrive."""
         cursor = self._collection.find(
-            {"correlation_id": correlation_id}
+            query, NO_ID_PROJECTION, batch_size=QUERY_BATCH_SIZE
         ).sort("timestamp", 1)
-        docs = await cursor.to_list(length=None)
-        return [self._doc_to_event(doc) for doc in docs]
+        doc_to_event = self._doc_to_event
+        return [doc_to_event(doc) async for doc in cursor]
+
+    async def query(self, correlation_id: str) -> List[EventEnvelope]:
+        """Query events by correlation_id."""
+        return await self._find({"correlation_id": correlation_id})
 
     async def query_by_type(self, event_type: EventType) -> List[EventEnvelope]:
         """Query events by event_type."""
-        cursor = self._collection.find(
-            {"event_type": event_type.value}
-        ).sort("timestamp", 1)
-        docs = await cursor.to_list(length=None)
-        return [self._doc_to_event(doc) for doc in docs]
+        return await self._find({"event_type": event_type.value})
 
     async def query_since(self, timestamp: datetime) -> List[EventEnvelope]:
         """Query events since a given timestamp."""
-        cursor = self._collection.find(
-            {"timestamp": {"$gte": timestamp.isoformat()}}
-        ).sort("timestamp", 1)
-        docs = await cursor.to_list(length=None)
-        return [self._doc_to_event(doc) for doc in docs]
+        return await self._find({"timestamp": {"$gte": timestamp.isoformat()}})
 
     async def get_all(self) -> List[EventEnvelope]:
         """Get all events."""
-        cursor = self._collection.find().sort("timestamp", 1)
-        docs = await cursor.to_list(length=None)
-        return [self._doc_to_event(doc) for doc in docs]
+        return await self._find({})
 
     async def count(self) -> int:
-        """Get total event count."""
-        return await self._collection.count_documents({})
+        """Get total event count (from collection metadata, without a scan).
+
+        The estimate can drift after an unclean shutdown and counts orphaned
+        documents on sharded clusters; use count_documents() for an exact,
+        filtered count.
+        """
+        return await self._collection.estimated_document_count()
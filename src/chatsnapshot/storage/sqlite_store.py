@@ -1,9 +1,9 @@
 # /src/chatsnapshot/storage/sqlite_store.py
 # SQLite-based EventStore implementation (async with aiosqlite)
 
-import json
 from datetime import datetime
-from typing import List
+from pathlib import Path
+from typing import AsyncIterator, List, Optional, Sequence
 
 try:
     import aiosqlite
@@ -12,120 +12,367 @@ except ImportError:
     HAS_AIOSQLITE = False
 
 from .base import EventStore
-from ..events.envelope import EventEnvelope
-from ..events.types import EventType
+from .batching import WriteBatcher
+from ..events.envelope import EventEnvelope, EventSource, datetime_to_us, json_dumps, json_loads, us_to_datetime
+from ..events.types import (
+    EventType,
+    EVENT_TYPE_BY_VALUE,
+    EVENT_TYPE_VALUES,
+    EVENT_ORIGIN_VALUES,
+    RUNTIME_TYPE_VALUES,
+)
+
+
+# Accepted values for the PRAGMAs exposed as constructor arguments
+JOURNAL_MODES = {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"}
+SYNCHRONOUS_MODES = {"OFF", "NORMAL", "FULL", "EXTRA"}
+
+# Schema version stored in PRAGMA user_version (0 = legacy events table or new database)
+SCHEMA_VERSION = 1
+
+# Column order shared by INSERT and SELECT statements
+EVENT_COLUMNS = (
+    "event_id, event_type, ts_us, correlation_id, causation_id, "
+    "origin, runtime, agent_name, payload"
+)
+
+# Statements are module constants so every call passes the identical string
+# and hits sqlite3's per-connection statement cache instead of re-preparing
+INSERT_EVENT_SQL = f"INSERT INTO event_log ({EVENT_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+SELECT_BY_CORRELATION_SQL = f"SELECT {EVENT_COLUMNS} FROM event_log WHERE correlation_id = ? ORDER BY ts_us"
+SELECT_BY_TYPE_SQL = f"SELECT {EVENT_COLUMNS} FROM event_log WHERE event_type = ? ORDER BY ts_us"
+SELECT_SINCE_SQL = f"SELECT {EVENT_COLUMNS} FROM event_log WHERE ts_us >= ? ORDER BY ts_us"
+SELECT_ALL_SQL = f"SELECT {EVENT_COLUMNS} FROM event_log ORDER BY ts_us"
+
+# Rows fetched per round-trip when streaming query results
+ITER_FETCH_SIZE = 500
 
 
 class SQLiteEventStore(EventStore):
     """SQLite-based event store with indexed queries.
 
-    Uses an append-only events table with indexes on:
-    - correlation_id
-    - event_type
-    - timestamp
+    Events live in an append-only event_log table keyed by event_id
+    (WITHOUT ROWID, so the primary key is the table's B-tree). Timestamps
+    are stored as integer microseconds (ts_us), the source as plain
+    origin/runtime/agent_name columns and the payload as a JSON BLOB, so
+    decoding a row parses one JSON document. Indexes:
+    - (correlation_id, ts_us) - serves query() filter and ordering
+    - (event_type, ts_us) - serves query_by_type() filter and ordering
+    - ts_us - serves query_since() and get_all()
+
+    Databases created by earlier versions are migrated on initialize(): a
+    legacy events table is copied into event_log and kept as events_v1.
+
+    Appends are coalesced: rows from concurrent append() calls are written
+    with a single executemany inside one transaction, so N concurrent
+    appends cost one commit (and one fsync) instead of N. append() still
+    returns only after its row has been committed.
+
+    The connection is opened with journal_mode=WAL and synchronous=NORMAL
+    by default. WAL turns each commit into a sequential log append and lets
+    readers run alongside the writer; combined with batched commits this
+    keeps fsyncs to roughly one per batch. synchronous=NORMAL can lose the
+    last transactions on power loss (never on a process crash); pass
+    synchronous="FULL" for strict durability or "OFF" for throughput.
+
+    Other connection settings: busy_timeout (wait for locks held by other
+    connections instead of failing with SQLITE_BUSY), memory-mapped reads
+    (mmap_size), in-memory temp storage and a 64 MiB page cache. The
+    connection runs in autocommit mode; every write is wrapped in an
+    explicit BEGIN IMMEDIATE/COMMIT so the write lock is taken up front.
+    close() runs PRAGMA optimize so query-planner statistics stay current.
+
+    Reads go through a small pool of read-only connections (read_connections,
+    used round-robin), so queries run on their own aiosqlite threads instead
+    of queueing behind writes on the writer connection; under WAL they also
+    read concurrently with an open write transaction. In-memory and
+    temporary ("") databases are private to one connection, and file: URIs
+    can't be turned into a read-only URI reliably, so those always read
+    through the writer.
 
     Requires: aiosqlite (pip install aiosqlite)
     """
 
-    def __init__(self, db_path: str = "./chatsnapshot_events.db"):
+    # Each append_many() commits in one transaction, rolled back on failure
+    atomic_append_many = True
+
+    def __init__(
+        self,
+        db_path: str = "./chatsnapshot_events.db",
+        batch_size: int = 50,
+        batch_timeout_ms: float = 0.0,
+        journal_mode: str = "WAL",
+        synchronous: str = "NORMAL",
+        busy_timeout_ms: int = 5000,
+        mmap_size: int = 256 * 1024 * 1024,
+        read_connections: int = 2
+    ):
+        """Initialize the store.
+
+        Args:
+            db_path: Path to the SQLite database file
+            batch_size: Maximum number of rows written per transaction
+            batch_timeout_ms: How long to wait for more rows before committing
+                a partial batch (0 = commit whatever is already queued)
+            journal_mode: SQLite journal_mode PRAGMA (ignored for :memory:)
+            synchronous: SQLite synchronous PRAGMA
+            busy_timeout_ms: How long to wait on a locked database (busy_timeout PRAGMA)
+            mmap_size: Bytes of the database file to memory-map for reads (0 = off)
+            read_connections: Read-only connections used for queries (0 = read
+                through the writer connection)
+        """
         if not HAS_AIOSQLITE:
             raise ImportError("aiosqlite is required for SQLiteEventStore. Install with: pip install aiosqlite")
+        journal_mode = journal_mode.upper()
+        synchronous = synchronous.upper()
+        if journal_mode not in JOURNAL_MODES:
+            raise ValueError(f"Invalid journal_mode: {journal_mode}")
+        if synchronous not in SYNCHRONOUS_MODES:
+            raise ValueError(f"Invalid synchronous mode: {synchronous}")
         self._db_path = db_path
+        self._journal_mode = journal_mode
+        self._synchronous = synchronous
+        self._busy_timeout_ms = int(busy_timeout_ms)
+        self._mmap_size = int(mmap_size)
+        if db_path in ("", ":memory:") or db_path.startswith("file:"):
+            read_connections = 0
+        self._read_connections = max(0, read_connections)
         self._db = None
+        self._readers: List["aiosqlite.Connection"] = []
+        self._next_reader = 0
+        self._batch_size = batch_size
+        self._batch_timeout_ms = batch_timeout_ms
+        self._batcher: Optional[WriteBatcher[tuple]] = None
 
     async def initialize(self) -> None:
         """Create database and tables if they don't exist."""
-        self._db = await aiosqlite.connect(self._db_path)
+        self._db = await aiosqlite.connect(self._db_path, isolation_level=None)
+        await self._configure_connection(self._db)
+        await self._create_schema()
+
+        # Opened after the schema exists; read-only connections can't create it
+        reader_uri = Path(self._db_path).resolve().as_uri() + "?mode=ro"
+        for _ in range(self._read_connections):
+            reader = await aiosqlite.connect(reader_uri, uri=True, isolation_level=None)
+            await self._configure_connection(reader, writer=False)
+            self._readers.append(reader)
+
+        self._batcher = WriteBatcher(
+            self._write_rows,
+            batch_size=self._batch_size,
+            batch_timeout_ms=self._batch_timeout_ms
+        )
+        self._batcher.start()
+
+    async def _configure_connection(self, db: "aiosqlite.Connection", writer: bool = True) -> None:
+        """Apply connection PRAGMAs (journal/sync settings only on the writer)."""
+        pragmas = [
+            f"PRAGMA busy_timeout={self._busy_timeout_ms};",
+            f"PRAGMA mmap_size={self._mmap_size};",
+            "PRAGMA temp_store=MEMORY;",
+            "PRAGMA cache_size=-65536;",
+        ]
+        if writer:
+            pragmas.insert(0, f"PRAGMA synchronous={self._synchronous};")
+            # In-memory databases have no journal file to configure
+            if self._db_path != ":memory:":
+                pragmas.insert(0, f"PRAGMA journal_mode={self._journal_mode};")
+        await db.executescript("\n".join(pragmas))
+
+    async def _create_schema(self) -> None:
+        """Create the event_log table, migrating a legacy events table if present."""
+        await self._db.execute("BEGIN IMMEDIATE")
+        try:
+            cursor = await self._db.execute("PRAGMA user_version")
+            version = (await cursor.fetchone())[0]
+            if version < SCHEMA_VERSION:
+                await self._create_event_log()
+                await self._db.execute("CREATE INDEX IF NOT EXISTS ix_event_log_corr_ts ON event_log(correlation_id, ts_us)")
+                await self._db.execute("CREATE INDEX IF NOT EXISTS ix_event_log_type_ts ON event_log(event_type, ts_us)")
+                await self._db.execute("CREATE INDEX IF NOT EXISTS ix_event_log_ts ON event_log(ts_us)")
+
+                cursor = await self._db.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'events'"
+                )
+                if await cursor.fetchone():
+                    await self._migrate_legacy_events()
+
+                await self._db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            await self._db.execute("COMMIT")
+        except Exception:
+            # Some errors (e.g. SQLITE_FULL) already rolled the transaction back
+            if self._db.in_transaction:
+                await self._db.execute("ROLLBACK")
+            raise
+
+    async def _create_event_log(self) -> None:
+        """Create the event_log table if it doesn't exist."""
         await self._db.execute("""
-            CREATE TABLE IF NOT EXISTS events (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                event_id TEXT UNIQUE NOT NULL,
+            CREATE TABLE IF NOT EXISTS event_log (
+                event_id TEXT PRIMARY KEY,
                 event_type TEXT NOT NULL,
-                timestamp TEXT NOT NULL,
+                ts_us INTEGER NOT NULL,
                 correlation_id TEXT NOT NULL,
                 causation_id TEXT,
-                source TEXT NOT NULL,
-                payload TEXT NOT NULL
-            )
+                origin TEXT NOT NULL,
+                runtime TEXT NOT NULL,
+                agent_name TEXT,
+                payload BLOB NOT NULL
+            ) WITHOUT ROWID
         """)
-        await self._db.execute("CREATE INDEX IF NOT EXISTS idx_correlation ON events(correlation_id)")
-        await self._db.execute("CREATE INDEX IF NOT EXISTS idx_event_type ON events(event_type)")
-        await self._db.execute("CREATE INDEX IF NOT EXISTS idx_timestamp ON events(timestamp)")
-        await self._db.commit()
+
+    @staticmethod
+    def _split_source(source) -> tuple:
+        """Decode a JSON source document into (origin, runtime, agent_name)."""
+        data = json_loads(source)
+        return data["origin"], data.get("runtime", "none"), data.get("agent_name")
+
+    async def _migrate_legacy_events(self) -> None:
+        """Copy rows from the legacy events table into event_log."""
+        cursor = await self._db.execute(
+            "SELECT event_id, event_type, timestamp, correlation_id, causation_id, source, payload FROM events"
+        )
+        rows = [
+            (
+                event_id,
+                event_type,
+                datetime_to_us(datetime.fromisoformat(timestamp)),
+                correlation_id,
+                causation_id,
+                *self._split_source(source),
+                payload.encode("utf-8") if isinstance(payload, str) else payload
+            )
+            for event_id, event_type, timestamp, correlation_id, causation_id, source, payload
+            in await cursor.fetchall()
+        ]
+        await self._db.executemany(
+            f"INSERT OR IGNORE INTO event_log ({EVENT_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows
+        )
+        await self._db.execute("ALTER TABLE events RENAME TO events_v1")
 
     async def close(self) -> None:
-        """Close the database connection."""
+        """Flush pending appends and close the database connection."""
+        if self._batcher:
+            await self._batcher.stop()
+            self._batcher = None
+        for reader in self._readers:
+            await reader.close()
+        self._readers.clear()
         if self._db:
+            # Refresh planner statistics for indexes the queries actually used
+            await self._db.execute("PRAGMA optimize")
             await self._db.close()
             self._db = None
 
     async def append(self, event: EventEnvelope) -> None:
         """Append an event to the database."""
-        await self._db.execute(
-            """
-            INSERT INTO events (event_id, event_type, timestamp, correlation_id, causation_id, source, payload)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                event.event_id,
-                event.event_type.value,
-                event.timestamp.isoformat(),
-                event.correlation_id,
-                event.causation_id,
-                json.dumps(event.source.to_dict()),
-                json.dumps(event.payload)
+        await self._batcher.submit(self._event_to_row(event))
+
+    async def append_many(self, events: Sequence[EventEnvelope]) -> None:
+        """Append several events in a single transaction."""
+        await self._batcher.submit_many([self._event_to_row(event) for event in events])
+
+    async def _write_rows(self, rows: List[tuple]) -> None:
+        """Write a batch of rows in a single transaction."""
+        await self._db.execute("BEGIN IMMEDIATE")
+        try:
+            await self._db.executemany(
+                INSERT_EVENT_SQL,
+                rows
             )
+            await self._db.execute("COMMIT")
+        except Exception:
+            # Some errors (e.g. SQLITE_FULL) already rolled the transaction back
+            if self._db.in_transaction:
+                await self._db.execute("ROLLBACK")
+            raise
+
+    def _event_to_row(self, event: EventEnvelope) -> tuple:
+        """Convert an EventEnvelope to an insert row."""
+        source = event.source
+        return (
+            event.event_id,
+            EVENT_TYPE_VALUES[event.event_type],
+            datetime_to_us(event.timestamp),
+            event.correlation_id,
+            event.causation_id,
+            EVENT_ORIGIN_VALUES[source.origin],
+            RUNTIME_TYPE_VALUES[source.runtime],
+            source.agent_name,
+            json_dumps(event.payload)
         )
-        await self._db.commit()
 
     def _row_to_event(self, row) -> EventEnvelope:
-        """Convert a database row to an EventEnvelope."""
-        from ..events.envelope import EventSource
+        """Convert a database row (EVENT_COLUMNS order) to an EventEnvelope."""
         return EventEnvelope(
-            event_id=row[1],
-            event_type=EventType(row[2]),
-            timestamp=datetime.fromisoformat(row[3]),
-            correlation_id=row[4],
-            causation_id=row[5],
-            source=EventSource.from_dict(json.loads(row[6])),
-            payload=json.loads(row[7])
+            event_id=row[0],
+            event_type=EVENT_TYPE_BY_VALUE.get(row[1]) or EventType(row[1]),
+            timestamp=us_to_datetime(row[2]),
+            correlation_id=row[3],
+            causation_id=row[4],
+            source=EventSource.from_values(row[5], row[6], row[7]),
+            payload=json_loads(row[8])
         )
 
+    def _reader(self) -> "aiosqlite.Connection":
+        """Pick the connection for the next read (round-robin over the pool)."""
+        readers = self._readers
+        if not readers:
+            return self._db
+        self._next_reader = (self._next_reader + 1) % len(readers)
+        return readers[self._next_reader]
+
+    async def _fetch_all(self, sql: str, params: tuple = ()) -> List[EventEnvelope]:
+        """Run a query on a read connection and convert every row."""
+        cursor = await self._reader().execute(sql, params)
+        row_to_event = self._row_to_event
+        return [row_to_event(row) for row in await cursor.fetchall()]
+
     async def query(self, correlation_id: str) -> List[EventEnvelope]:
         """Query events by correlation_id."""
-        cursor = await self._db.execute(
-            "SELECT * FROM events WHERE correlation_id = ? ORDER BY timestamp",
-            (correlation_id,)
-        )
-        rows = await cursor.fetchall()
-        return [self._row_to_event(row) for row in rows]
+        return await self._fetch_all(SELECT_BY_CORRELATION_SQL, (correlation_id,))
 
     async def query_by_type(self, event_type: EventType) -> List[EventEnvelope]:
         """Query events by event_type."""
-        cursor = await self._db.execute(
-            "SELECT * FROM events WHERE event_type = ? ORDER BY timestamp",
-            (event_type.value,)
-        )
-        rows = await cursor.fetchall()
-        return [self._row_to_event(row) for row in rows]
+        return await self._fetch_all(SELECT_BY_TYPE_SQL, (event_type.value,))
 
     async def query_since(self, timestamp: datetime) -> List[EventEnvelope]:
         """Query events since a given timestamp."""
-        cursor = await self._db.execute(
-            "SELECT * FROM events WHERE timestamp >= ? ORDER BY timestamp",
-            (timestamp.isoformat(),)
-        )
-        rows = await cursor.fetchall()
-        return [self._row_to_event(row) for row in rows]
+        return await self._fetch_all(SELECT_SINCE_SQL, (datetime_to_us(timestamp),))
 
     async def get_all(self) -> List[EventEnvelope]:
         """Get all events."""
-        cursor = await self._db.execute("SELECT * FROM events ORDER BY timestamp")
-        rows = await cursor.fetchall()
-        return [self._row_to_event(row) for row in rows]
+        return await self._fetch_all(SELECT_ALL_SQL)
+
+    async def _iter_rows(self, sql: str, params: tuple = ()) -> AsyncIterator[EventEnvelope]:
+        """Stream query results, fetching ITER_FETCH_SIZE rows at a time."""
+        async with self._reader().execute(sql, params) as cursor:
+            while True:
+                rows = await cursor.fetchmany(ITER_FETCH_SIZE)
+                if not rows:
+                    break
+                for row in rows:
+                    yield self._row_to_event(row)
+
+    def iter_query(self, correlation_id: str) -> AsyncIterator[EventEnvelope]:
+        """Stream events by correlation_id."""
+        return self._iter_rows(SELECT_BY_CORRELATION_SQL, (correlation_id,))
+
+    def iter_by_type(self, event_type: EventType) -> AsyncIterator[EventEnvelope]:
+        """Stream events by event_type."""
+        return self._iter_rows(SELECT_BY_TYPE_SQL, (event_type.value,))
+
+    def iter_since(self, timestamp: datetime) -> AsyncIterator[EventEnvelope]:
+        """Stream events since a given timestamp."""
+        return self._iter_rows(SELECT_SINCE_SQL, (datetime_to_us(timestamp),))
+
+    def iter_all(self) -> AsyncIterator[EventEnvelope]:
+        """Stream all events."""
+        return self._iter_rows(SELECT_ALL_SQL)
 
     async def count(self) -> int:
         """Get total event count."""
-        cursor = await self._db.execute("SELECT COUNT(*) FROM events")
+        cursor = await self._reader().execute("SELECT COUNT(*) FROM event_log")
         row = await cursor.fetchone()
         return row[0] if row else 0
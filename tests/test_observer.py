@@ -7,12 +7,16 @@ from datetime import datetime, timedelta
 
 from chatsnapshot import (
     Observer,
+    ChatSnapshot,
     EventEnvelope,
     EventSource,
     EventType,
     EventOrigin,
     RuntimeType,
     MemoryEventStore,
+    JSONEventStore,
+    SQLiteEventStore,
+    AG2IngestAdapter,
     SnapshotProjection,
     TranscriptProjection,
 )
@@ -65,10 +69,89 @@ class TestEventEnvelope:
         data = event.to_dict()
         restored = EventEnvelope.from_dict(data)
 
-        assert restored.event_id == event.event_id
-        assert restored.event_type == event.event_type
-        assert restored.correlation_id == event.correlation_id
-        assert restored.payload == event.payload
+        assert restored == event
+
+    def test_non_finite_floats_round_trip(self):
+        """Test that NaN/Infinity payload values survive JSON serialization."""
+        import json
+        import math
+
+        event = EventEnvelope.create(
+            event_type=EventType.EXECUTION_STATE_CHANGE,
+            correlation_id="session_001",
+            payload={"scores": [float("nan"), float("inf"), -float("inf"), 1.5]}
+        )
+
+        restored = EventEnvelope.from_json(event.to_json_bytes())
+        nan, inf, neg_inf, finite = restored.payload["scores"]
+        assert math.isnan(nan)
+        assert inf == float("inf") and neg_inf == -float("inf")
+        assert finite == 1.5
+
+        # Documents written by the stdlib json module load too
+        legacy = EventEnvelope.from_json(json.dumps(event.to_dict()))
+        assert math.isnan(legacy.payload["scores"][0])
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_json_encoders_accept_the_same_types(self, monkeypatch, use_orjson):
+        """Test that payload encoding doesn't depend on whether orjson is installed."""
+        import uuid
+        from dataclasses import dataclass
+        from chatsnapshot.events import envelope
+
+        if use_orjson and not envelope.HAS_ORJSON:
+            pytest.skip("orjson is not installed")
+        monkeypatch.setattr(envelope, "HAS_ORJSON", use_orjson)
+
+        @dataclass
+        class Point:
+            x: int
+            y: int
+
+        payload = {
+            "at": datetime(2024, 1, 2, 3, 4, 5, 600),
+            "id": uuid.UUID(int=1),
+            "kind": EventType.EXECUTION_MESSAGE,
+            "point": Point(1, 2),
+        }
+        assert envelope.json_loads(envelope.json_dumps(payload)) == {
+            "at": "2024-01-02T03:04:05.000600",
+            "id": "00000000-0000-0000-0000-000000000001",
+            "kind": "execution.message",
+            "point": {"x": 1, "y": 2},
+        }
+        assert envelope.json_loads(envelope.json_dumps({"big": 2 ** 70})) == {"big": 2 ** 70}
+        assert envelope.json_loads(envelope.json_dumps({1: "a", None: "b"})) == {"1": "a", "null": "b"}
+
+        for unsupported in ({"value": object()}, {(1, 2): "tuple key"}):
+            with pytest.raises(TypeError):
+                envelope.json_dumps(unsupported)
+
+    def test_from_dict_rejects_unknown_event_type(self):
+        """Test that decoding an unknown event type still raises ValueError."""
+        data = EventEnvelope.create(
+            event_type=EventType.EXECUTION_MESSAGE,
+            correlation_id="test_001",
+            payload={}
+        ).to_dict()
+        data["event_type"] = "execution.unknown"
+
+        with pytest.raises(ValueError):
+            EventEnvelope.from_dict(data)
+
+    def test_event_json_bytes(self):
+        """Test to_json_bytes() and from_json()."""
+        event = EventEnvelope.create(
+            event_type=EventType.EXECUTION_MESSAGE,
+            correlation_id="test_001",
+            payload={"content": "Hello", "n": 1}
+        )
+
+        data = event.to_json_bytes()
+        restored = EventEnvelope.from_json(data)
+
+        assert isinstance(data, bytes)
+        assert restored.to_dict() == event.to_dict()
 
     def test_event_with_causation(self):
         """Test causal linking of events."""
@@ -87,6 +170,73 @@ class TestEventEnvelope:
 
         assert child.causation_id == parent.event_id
 
+    def test_create_with_explicit_timestamp(self):
+        """Test that a caller-supplied timestamp is used as-is."""
+        timestamp = datetime(2024, 1, 1, 12, 0, 0, 123456)
+        event = EventEnvelope.create(
+            event_type=EventType.EXECUTION_MESSAGE,
+            correlation_id="session_001",
+            payload={},
+            timestamp=timestamp
+        )
+
+        assert event.timestamp == timestamp
+
+    def test_from_dict_accepts_epoch_microseconds(self):
+        """Test that integer epoch-microsecond timestamps decode like ISO strings."""
+        timestamp = datetime(2024, 1, 1, 12, 0, 0, 123456)
+        event = EventEnvelope.create(
+            event_type=EventType.EXECUTION_MESSAGE,
+            correlation_id="session_001",
+            payload={"content": "Hello"},
+            timestamp=timestamp
+        )
+        data = event.to_dict()
+        data["timestamp"] = 1_704_110_400_123_456
+
+        assert EventEnvelope.from_dict(data).timestamp == timestamp
+
+    def test_pre_epoch_timestamp_in_fresh_thread(self):
+        """Test that a pre-epoch timestamp gets an ID even as a thread's first event."""
+        import threading
+
+        results = []
+
+        def create():
+            try:
+                results.append(EventEnvelope.create(
+                    event_type=EventType.EXECUTION_MESSAGE,
+                    correlation_id="session_001",
+                    payload={},
+                    timestamp=datetime(1960, 1, 1)
+                ))
+            except Exception as e:
+                results.append(e)
+
+        thread = threading.Thread(target=create)
+        thread.start()
+        thread.join()
+
+        event = results[0]
+        assert isinstance(event, EventEnvelope)
+        assert event.timestamp == datetime(1960, 1, 1)
+        assert len(event.event_id) == 26
+
+    def test_event_ids_sort_in_creation_order(self):
+        """Test that generated event IDs are unique and monotonic."""
+        ids = [
+            EventEnvelope.create(
+                event_type=EventType.EXECUTION_MESSAGE,
+                correlation_id="test_001",
+                payload={}
+            ).event_id
+            for _ in range(1000)
+        ]
+
+        assert len(set(ids)) == len(ids)
+        assert ids == sorted(ids)
+        assert all(len(event_id) == 26 for event_id in ids)
+
 
 # ========== MemoryEventStore Tests ==========
 
@@ -131,6 +281,27 @@ class TestMemoryEventStore:
         tool_calls = await store.query_by_type(EventType.EXECUTION_TOOL_CALL)
         assert len(tool_calls) == 1
 
+    @pytest.mark.asyncio
+    async def test_out_of_order_appends_stay_sorted(self):
+        """Test that late-arriving events are indexed in timestamp order."""
+        store = MemoryEventStore()
+        await store.initialize()
+
+        base = datetime(2024, 1, 1, 12, 0, 0)
+        for offset in (0, 2, 1):
+            await store.append(EventEnvelope.create(
+                event_type=EventType.EXECUTION_MESSAGE,
+                correlation_id="session_001",
+                payload={"content": str(offset)},
+                timestamp=base + timedelta(seconds=offset)
+            ))
+
+        events = await store.query("session_001")
+        assert [e.payload["content"] for e in events] == ["0", "1", "2"]
+
+        since = await store.query_since(base + timedelta(seconds=1))
+        assert [e.payload["content"] for e in since] == ["1", "2"]
+
     @pytest.mark.asyncio
     async def test_count(self):
         """Test event count."""
@@ -159,6 +330,409 @@ class TestMemoryEventStore:
             assert await store.count() == 1
 
 
+# ========== JSONEventStore Tests ==========
+
+class TestJSONEventStore:
+    @pytest.mark.asyncio
+    async def test_append_and_query(self, tmp_path):
+        """Test that appended events round-trip through the JSON Lines file."""
+        async with JSONEventStore(str(tmp_path)) as store:
+            event = EventEnvelope.create(
+                event_type=EventType.EXECUTION_MESSAGE,
+                correlation_id="session_001",
+                payload={"content": "Hello"}
+            )
+            await store.append(event)
+
+            events = await store.query("session_001")
+            assert len(events) == 1
+            assert events[0].to_dict() == event.to_dict()
+
+    @pytest.mark.asyncio
+    async def test_append_many_with_fsync(self, tmp_path):
+        """Test that bulk appends are readable and counted."""
+        async with JSONEventStore(str(tmp_path), fsync=True) as store:
+            await store.append_many([
+                EventEnvelope.create(
+                    event_type=EventType.EXECUTION_MESSAGE,
+                    correlation_id="session_001",
+                    payload={"content": f"Message {i}"}
+                )
+                for i in range(3)
+            ])
+
+            assert await store.count() == 3
+            events = await store.query("session_001")
+            assert [e.payload["content"] for e in events] == ["Message 0", "Message 1", "Message 2"]
+
+    @pytest.mark.asyncio
+    async def test_buffered_appends(self, tmp_path):
+        """Test that buffered appends are written on flush and before queries."""
+        events_file = tmp_path / "events.jsonl"
+        async with JSONEventStore(str(tmp_path), buffer_size=10, flush_interval_ms=60_000) as store:
+            for i in range(3):
+                await store.append(EventEnvelope.create(
+                    event_type=EventType.EXECUTION_MESSAGE,
+                    correlation_id="session_001",
+                    payload={"content": f"Message {i}"}
+                ))
+            assert events_file.read_bytes() == b""
+
+            await store.flush()
+            assert len(events_file.read_bytes().splitlines()) == 3
+
+            await store.append(EventEnvelope.create(
+                event_type=EventType.EXECUTION_MESSAGE,
+                correlation_id="session_001",
+                payload={"content": "Message 3"}
+            ))
+            assert len(await store.query("session_001")) == 4
+
+    @pytest.mark.asyncio
+    async def test_unserializable_event_fails_its_own_append(self, tmp_path):
+        """Test that a bad payload is rejected on append without losing buffered events."""
+        async with JSONEventStore(str(tmp_path), buffer_size=10, flush_interval_ms=60_000) as store:
+            await store.append(EventEnvelope.create(
+                event_type=EventType.EXECUTION_MESSAGE,
+                correlation_id="session_001",
+                payload={"content": "Hello"}
+            ))
+            with pytest.raises(TypeError):
+                await store.append(EventEnvelope.create(
+                    event_type=EventType.EXECUTION_MESSAGE,
+                    correlation_id="session_001",
+                    payload={"content": object()}
+                ))
+
+            await store.flush()
+            assert len((tmp_path / "events.jsonl").read_bytes().splitlines()) == 1
+            assert await store.count() == 1
+
+    @pytest.mark.asyncio
+    async def test_buffered_appends_are_flushed_by_timer(self, tmp_path):
+        """Test that a partially filled buffer is written once the interval passes."""
+        events_file = tmp_path / "events.jsonl"
+        async with JSONEventStore(str(tmp_path), buffer_size=10, flush_interval_ms=10) as store:
+            await store.append(EventEnvelope.create(
+                event_type=EventType.EXECUTION_MESSAGE,
+                correlation_id="session_001",
+                payload={"content": "Hello"}
+            ))
+            assert events_file.read_bytes() == b""
+
+            for _ in range(100):
+                await asyncio.sleep(0.01)
+                if events_file.read_bytes():
+                    break
+            assert len(events_file.read_bytes().splitlines()) == 1
+
+    @pytest.mark.asyncio
+    async def test_reads_events_appended_by_another_writer(self, tmp_path):
+        """Test that the cached view picks up lines written elsewhere."""
+        async with JSONEventStore(str(tmp_path)) as reader, JSONEventStore(str(tmp_path)) as writer:
+            for i in range(2):
+                await writer.append(EventEnvelope.create(
+                    event_type=EventType.EXECUTION_MESSAGE,
+                    correlation_id="session_001",
+                    payload={"content": f"Message {i}"}
+                ))
+                events = await reader.query("session_001")
+                assert len(events) == i + 1
+
+            # And the other way round
+            await reader.append(EventEnvelope.create(
+                event_type=EventType.EXECUTION_MESSAGE,
+                correlation_id="session_001",
+                payload={"content": "Message 2"}
+            ))
+            assert await writer.count() == 3
+            assert await reader.count() == 3
+
+
+# ========== SQLiteEventStore Tests ==========
+
+class TestSQLiteEventStore:
+    @pytest.mark.asyncio
+    async def test_append_and_query(self, tmp_path):
+        """Test that appended events round-trip through SQLite."""
+        async with SQLiteEventStore(str(tmp_path / "events.db")) as store:
+            event = EventEnvelope.create(
+                event_type=EventType.EXECUTION_MESSAGE,
+                correlation_id="session_001",
+                payload={"content": "Hello"}
+            )
+            await store.append(event)
+
+            events = await store.query("session_001")
+            assert len(events) == 1
+            assert events[0].event_id == event.event_id
+            assert events[0].payload == {"content": "Hello"}
+
+    @pytest.mark.asyncio
+    async def test_concurrent_appends(self):
+        """Test that concurrent appends are all committed."""
+        async with SQLiteEventStore(":memory:", batch_size=10) as store:
+            await asyncio.gather(*(
+                store.append(EventEnvelope.create(
+                    event_type=EventType.EXECUTION_MESSAGE,
+                    correlation_id="session_001",
+                    payload={"content": f"Message {i}"}
+                ))
+                for i in range(25)
+            ))
+
+            assert await store.count() == 25
+
+    @pytest.mark.asyncio
+    async def test_failed_append_is_isolated(self):
+        """Test that a duplicate event only fails its own append."""
+        async with SQLiteEventStore(":memory:") as store:
+            event = EventEnvelope.create(
+                event_type=EventType.EXECUTION_MESSAGE,
+                correlation_id="session_001",
+                payload={"content": "Hello"}
+            )
+            await store.append(event)
+
+            other = EventEnvelope.create(
+                event_type=EventType.EXECUTION_MESSAGE,
+                correlation_id="session_001",
+                payload={"content": "World"}
+            )
+            results = await asyncio.gather(
+                store.append(event),
+                store.append(other),
+                return_exceptions=True
+            )
+
+            assert isinstance(results[0], Exception)
+            assert results[1] is None
+            assert await store.count() == 2
+
+    @pytest.mark.asyncio
+    async def test_write_error_is_not_masked_by_rollback(self):
+        """Test that an error which already ended the transaction is raised as is."""
+        import sqlite3
+
+        async with SQLiteEventStore(":memory:") as store:
+            await store._db.execute("PRAGMA max_page_count = 8")
+            with pytest.raises(sqlite3.OperationalError, match="full"):
+                await store.append(EventEnvelope.create(
+                    event_type=EventType.EXECUTION_MESSAGE,
+                    correlation_id="session_001",
+                    payload={"content": "x" * 1_000_000}
+                ))
+
+    @pytest.mark.asyncio
+    async def test_connection_pragmas(self, tmp_path):
+        """Test that journal_mode/synchronous are applied on open."""
+        async with SQLiteEventStore(str(tmp_path / "events.db"), synchronous="off") as store:
+            cursor = await store._db.execute("PRAGMA journal_mode")
+            assert (await cursor.fetchone())[0] == "wal"
+            cursor = await store._db.execute("PRAGMA synchronous")
+            assert (await cursor.fetchone())[0] == 0
+            cursor = await store._db.execute("PRAGMA busy_timeout")
+            assert (await cursor.fetchone())[0] == 5000
+
+    @pytest.mark.asyncio
+    async def test_reads_do_not_wait_for_open_write(self, tmp_path):
+        """Test that queries use the reader pool while a write is in progress."""
+        async with SQLiteEventStore(str(tmp_path / "events.db")) as store:
+            await store.append(EventEnvelope.create(
+                event_type=EventType.EXECUTION_MESSAGE,
+                correlation_id="session_001",
+                payload={"content": "committed"}
+            ))
+
+            await store._db.execute("BEGIN IMMEDIATE")
+            await store._db.execute("DELETE FROM event_log")
+            try:
+                events = await asyncio.wait_for(store.query("session_001"), timeout=1)
+                assert [e.payload["content"] for e in events] == ["committed"]
+            finally:
+                await store._db.execute("ROLLBACK")
+
+    @pytest.mark.asyncio
+    async def test_private_and_uri_databases_read_through_writer(self, tmp_path):
+        """Test that temporary, in-memory and URI databases don't open readers."""
+        assert SQLiteEventStore(f"file:{tmp_path / 'events.db'}")._read_connections == 0
+
+        for db_path in ("", ":memory:"):
+            async with SQLiteEventStore(db_path) as store:
+                await store.append(EventEnvelope.create(
+                    event_type=EventType.EXECUTION_MESSAGE,
+                    correlation_id="session_001",
+                    payload={"content": "Hello"}
+                ))
+                assert len(await store.query("session_001")) == 1
+
+    @pytest.mark.asyncio
+    async def test_migrates_legacy_events_table(self, tmp_path):
+        """Test that a database with the legacy events table is migrated."""
+        import aiosqlite
+
+        event = EventEnvelope.create(
+            event_type=EventType.EXECUTION_MESSAGE,
+            correlation_id="session_001",
+            payload={"content": "Hello"}
+        )
+        db_path = str(tmp_path / "events.db")
+        async with aiosqlite.connect(db_path) as db:
+            await db.execute("""
+                CREATE TABLE events (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    event_id TEXT UNIQUE NOT NULL,
+                    event_type TEXT NOT NULL,
+                    timestamp TEXT NOT NULL,
+                    correlation_id TEXT NOT NULL,
+                    causation_id TEXT,
+                    source TEXT NOT NULL,
+                    payload TEXT NOT NULL
+                )
+            """)
+            await db.execute(
+                "INSERT INTO events (event_id, event_type, timestamp, correlation_id, causation_id, source, payload) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (event.event_id, event.event_type.value, event.timestamp.isoformat(), event.correlation_id,
+                 None, '{"origin": "system", "runtime": "none", "agent_name": null}', '{"content": "Hello"}')
+            )
+            await db.commit()
+
+        async with SQLiteEventStore(db_path) as store:
+            events = await store.query("session_001")
+            assert len(events) == 1
+            assert events[0].event_id == event.event_id
+            assert events[0].timestamp == event.timestamp
+            assert events[0].payload == {"content": "Hello"}
+
+    @pytest.mark.asyncio
+    async def test_stream_into_projection(self):
+        """Test streaming query results straight into a projection."""
+        async with Observer(SQLiteEventStore(":memory:")) as observer:
+            for i in range(3):
+                await observer.record(
+                    event_type=EventType.EXECUTION_MESSAGE,
+                    correlation_id="session_001",
+                    payload={"content": f"Message {i}"}
+                )
+
+            streamed = [e async for e in observer.iter_events("session_001")]
+            assert streamed == await observer.get_events("session_001")
+
+            snapshot = await SnapshotProjection().project_async(observer.iter_events("session_001"))
+            assert snapshot.round_count == 3
+
+    def test_invalid_pragma_rejected(self):
+        """Test that unknown PRAGMA values are rejected."""
+        with pytest.raises(ValueError):
+            SQLiteEventStore(journal_mode="WAL; DROP TABLE events")
+
+
+# ========== MongoDBEventStore Tests ==========
+# motor is optional: these tests drive the store's client sharing and bulk
+# inserts through stand-in client/collection objects instead of a server.
+
+class _StubMotorClient:
+    def __init__(self, connection_string, maxPoolSize):
+        self.max_pool_size = maxPoolSize
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class _RecordingCollection:
+    def __init__(self):
+        self.calls = []
+
+    async def insert_many(self, docs, ordered=True):
+        self.calls.append((docs, ordered))
+
+
+class _IndexedCollection:
+    def __init__(self, indexes):
+        self.indexes = indexes
+        self.dropped = []
+
+    async def create_indexes(self, models):
+        pass
+
+    async def index_information(self):
+        return {name: {} for name in self.indexes}
+
+    async def drop_index(self, name):
+        self.dropped.append(name)
+
+
+class TestMongoDBEventStore:
+    @pytest.mark.asyncio
+    async def test_shared_client_is_closed_with_last_store(self, monkeypatch):
+        """Test that stores share a client per pool size and the last release closes it."""
+        from chatsnapshot.storage import mongodb_store
+
+        monkeypatch.setattr(mongodb_store, "AsyncIOMotorClient", _StubMotorClient, raising=False)
+        monkeypatch.setattr(mongodb_store, "_CLIENT_CACHE", {})
+
+        key_a, client_a = mongodb_store._acquire_client("mongodb://db", 100)
+        key_b, client_b = mongodb_store._acquire_client("mongodb://db", 100)
+        key_c, client_c = mongodb_store._acquire_client("mongodb://db", 10)
+        assert client_a is client_b
+        assert client_c is not client_a
+        assert client_c.max_pool_size == 10
+
+        mongodb_store._release_client(key_a)
+        assert not client_a.closed
+        mongodb_store._release_client(key_b)
+        assert client_a.closed
+        assert not client_c.closed
+        mongodb_store._release_client(key_c)
+        assert client_c.closed
+        assert mongodb_store._CLIENT_CACHE == {}
+
+    @pytest.mark.asyncio
+    async def test_append_many_is_one_unordered_insert(self, monkeypatch):
+        """Test that append_many sends every event in a single unordered insert_many."""
+        from chatsnapshot.storage import mongodb_store
+
+        monkeypatch.setattr(mongodb_store, "HAS_MOTOR", True)
+        store = mongodb_store.MongoDBEventStore(client=object())
+        collection = store._write_collection = _RecordingCollection()
+        events = [
+            EventEnvelope.create(
+                event_type=EventType.EXECUTION_MESSAGE,
+                correlation_id="session_001",
+                payload={"content": f"Message {i}"}
+            )
+            for i in range(1200)
+        ]
+
+        await store.append_many(events)
+        await store.append_many([])
+
+        assert len(collection.calls) == 1
+        docs, ordered = collection.calls[0]
+        assert ordered is False
+        assert [doc["event_id"] for doc in docs] == [event.event_id for event in events]
+
+    @pytest.mark.asyncio
+    async def test_legacy_indexes_are_dropped_only_on_request(self, monkeypatch):
+        """Test that initialize() leaves existing indexes alone unless asked to migrate."""
+        from chatsnapshot.storage import mongodb_store
+
+        monkeypatch.setattr(mongodb_store, "HAS_MOTOR", True)
+        monkeypatch.setattr(mongodb_store, "ASCENDING", 1, raising=False)
+        monkeypatch.setattr(mongodb_store, "IndexModel", lambda *args, **kwargs: args, raising=False)
+
+        for drop_legacy_indexes, expected in ((False, []), (True, ["event_type_1"])):
+            collection = _IndexedCollection(["_id_", "event_type_1"])
+            client = {"chatsnapshot": {"events": collection}}
+            store = mongodb_store.MongoDBEventStore(
+                client=client, drop_legacy_indexes=drop_legacy_indexes
+            )
+            await store.initialize()
+            assert collection.dropped == expected
+
+
 # ========== Observer Tests ==========
 
 class TestObserver:
@@ -254,6 +828,259 @@ class TestObserver:
             assert len(received_1) == 1
             assert len(received_2) == 1
 
+    @pytest.mark.asyncio
+    async def test_queued_subscription(self):
+        """Test that a queued subscriber receives events in order without blocking record."""
+        received = []
+        release = asyncio.Event()
+
+        async def slow_callback(event):
+            await release.wait()
+            received.append(event.payload["content"])
+
+        async with Observer(MemoryEventStore()) as observer:
+            observer.subscribe(slow_callback, queue_size=10)
+
+            for i in range(3):
+                await observer.record(
+                    event_type=EventType.EXECUTION_MESSAGE,
+                    correlation_id="session_001",
+                    payload={"content": f"Message {i}"}
+                )
+            assert received == []
+
+            release.set()
+
+        assert received == ["Message 0", "Message 1", "Message 2"]
+
+    @pytest.mark.asyncio
+    async def test_unsubscribe_releases_blocked_record(self):
+        """Test that record() waiting on a full subscriber queue returns on unsubscribe."""
+        release = asyncio.Event()
+
+        async def stuck_callback(event):
+            await release.wait()
+
+        async with Observer(MemoryEventStore()) as observer:
+            subscription_id = observer.subscribe(stuck_callback, queue_size=1)
+            # First event is taken by the consumer, the second fills the queue
+            for i in range(2):
+                await observer.record(
+                    event_type=EventType.EXECUTION_MESSAGE,
+                    correlation_id="session_001",
+                    payload={"content": f"Message {i}"}
+                )
+                await asyncio.sleep(0)
+
+            blocked = asyncio.create_task(observer.record(
+                event_type=EventType.EXECUTION_MESSAGE,
+                correlation_id="session_001",
+                payload={"content": "Message 2"}
+            ))
+            await asyncio.sleep(0.01)
+            assert not blocked.done()
+
+            observer.unsubscribe(subscription_id)
+            await asyncio.wait_for(blocked, timeout=1)
+            assert await observer.count() == 3
+
+    @pytest.mark.asyncio
+    async def test_queued_subscription_requires_positive_size(self):
+        """Test that a queue_size that would leave the queue unbounded is rejected."""
+        async def callback(event):
+            pass
+
+        async with Observer(MemoryEventStore()) as observer:
+            for queue_size in (0, -1):
+                with pytest.raises(ValueError):
+                    observer.subscribe(callback, queue_size=queue_size)
+
+    @pytest.mark.asyncio
+    async def test_batched_writes(self, tmp_path):
+        """Test that concurrent records are coalesced into bulk appends."""
+        store = JSONEventStore(str(tmp_path))
+        calls = []
+        append_many = store.append_many
+
+        async def counting_append_many(events):
+            calls.append(len(events))
+            await append_many(events)
+
+        store.append_many = counting_append_many
+
+        async with Observer(store, batch_writes=True) as observer:
+            await asyncio.gather(*(
+                observer.record(
+                    event_type=EventType.EXECUTION_MESSAGE,
+                    correlation_id="session_001",
+                    payload={"content": f"Message {i}"}
+                )
+                for i in range(20)
+            ))
+
+            assert await observer.count() == 20
+            assert sum(calls) == 20
+            assert len(calls) < 20
+
+    @pytest.mark.asyncio
+    async def test_batched_writes_do_not_retry_partial_failures(self):
+        """Test that a partially stored batch is not written again event by event."""
+        store = MemoryEventStore()
+        append_many = store.append_many
+
+        async def partial_append_many(events):
+            # Stores the whole batch, then fails (like an unordered bulk insert)
+            await append_many(events)
+            if len(events) > 1:
+                raise RuntimeError("bulk insert failed")
+
+        store.append_many = partial_append_many
+
+        async with Observer(store, batch_writes=True) as observer:
+            await asyncio.gather(*(
+                observer.record(
+                    event_type=EventType.EXECUTION_MESSAGE,
+                    correlation_id="session_001",
+                    payload={"content": f"Message {i}"}
+                )
+                for i in range(5)
+            ), return_exceptions=True)
+
+            event_ids = [event.event_id for event in await observer.get_all_events()]
+            assert len(event_ids) == 5
+            assert len(set(event_ids)) == 5
+
+    @pytest.mark.asyncio
+    async def test_record_many(self):
+        """Test bulk recording stores all events and notifies in order."""
+        received = []
+
+        async def callback(event):
+            received.append(event)
+
+        async with Observer(MemoryEventStore()) as observer:
+            observer.subscribe(callback)
+            events = [
+                EventEnvelope.create(
+                    event_type=EventType.EXECUTION_MESSAGE,
+                    correlation_id="session_001",
+                    payload={"content": f"Message {i}"}
+                )
+                for i in range(3)
+            ]
+
+            second = []
+
+            async def second_callback(event):
+                second.append(event)
+
+            observer.subscribe(second_callback)
+            await observer.record_many(events)
+
+            assert await observer.count() == 3
+            assert received == events
+            assert second == events
+
+    @pytest.mark.asyncio
+    async def test_project_is_cached_until_new_event(self):
+        """Test that project() reuses results until the stream changes."""
+        async with Observer(MemoryEventStore(), projection_cache_size=16) as observer:
+            await observer.record(
+                event_type=EventType.EXECUTION_MESSAGE,
+                correlation_id="session_001",
+                payload={"content": "Hello"}
+            )
+
+            first = await observer.project("session_001", TranscriptProjection())
+            assert await observer.project("session_001", TranscriptProjection()) is first
+            assert await observer.project(
+                "session_001", TranscriptProjection(include_timestamps=False)
+            ) is not first
+
+            await observer.record(
+                event_type=EventType.EXECUTION_MESSAGE,
+                correlation_id="session_001",
+                payload={"content": "World"}
+            )
+
+            second = await observer.project("session_001", TranscriptProjection())
+            assert second is not first
+            assert "World" in second
+
+            snapshot = await observer.project("session_001", SnapshotProjection())
+            snapshot.messages.clear()
+            cached = await observer.project("session_001", SnapshotProjection())
+            assert cached is not snapshot
+            assert len(cached.messages) == 2
+
+    @pytest.mark.asyncio
+    async def test_project_is_not_cached_by_default(self):
+        """Test that project() sees events written directly to the store."""
+        async with Observer(MemoryEventStore()) as observer:
+            await observer.record(
+                event_type=EventType.EXECUTION_MESSAGE,
+                correlation_id="session_001",
+                payload={"content": "Hello"}
+            )
+            first = await observer.project("session_001", SnapshotProjection())
+
+            await observer.store.append(EventEnvelope.create(
+                event_type=EventType.EXECUTION_MESSAGE,
+                correlation_id="session_001",
+                payload={"content": "World"}
+            ))
+
+            second = await observer.project("session_001", SnapshotProjection())
+            assert first.round_count == 1
+            assert second.round_count == 2
+
+
+# ========== Ingest Tests ==========
+
+class _FakeGroupChat:
+    def __init__(self, messages):
+        self.messages = messages
+
+
+class TestAG2IngestAdapter:
+    @pytest.mark.asyncio
+    async def test_extract_from_groupchat(self):
+        """Test batch extraction records chained events in one call."""
+        async with Observer(MemoryEventStore()) as observer:
+            adapter = AG2IngestAdapter(observer, correlation_id="chat_001")
+            groupchat = _FakeGroupChat([
+                {"role": "user", "name": "Alice", "content": "Hi"},
+                {"role": "assistant", "name": "Bob", "tool_calls": [{"id": "call_1"}]},
+                {"role": "tool", "tool_call_id": "call_1", "content": "42"},
+            ])
+
+            events = await adapter.extract_from_groupchat(groupchat)
+
+            assert [e.event_type for e in events] == [
+                EventType.EXECUTION_MESSAGE,
+                EventType.EXECUTION_TOOL_CALL,
+                EventType.EXECUTION_TOOL_RESULT,
+            ]
+            assert events[0].causation_id is None
+            assert events[1].causation_id == events[0].event_id
+            assert events[2].causation_id == events[1].event_id
+            assert adapter.last_event_id == events[2].event_id
+            assert await observer.get_events("chat_001") == events
+
+    @pytest.mark.asyncio
+    async def test_causation_is_chained_per_correlation(self):
+        """Test that interleaved correlation_ids keep separate causation chains."""
+        async with Observer(MemoryEventStore()) as observer:
+            adapter = AG2IngestAdapter(observer)
+
+            a1 = await adapter.on_message({"content": "a1"}, correlation_id="chat_a")
+            b1 = await adapter.on_message({"content": "b1"}, correlation_id="chat_b")
+            a2 = await adapter.on_message({"content": "a2"}, correlation_id="chat_a")
+
+            assert b1.causation_id is None
+            assert a2.causation_id == a1.event_id
+            assert adapter.get_last_event_id("chat_b") == b1.event_id
+
 
 # ========== Projection Tests ==========
 
@@ -281,6 +1108,70 @@ class TestSnapshotProjection:
             assert snapshot.chat_id == "session_001"
             assert len(snapshot.messages) == 2
             assert snapshot.round_count == 2
+            assert list(snapshot.metadata) == [
+                "event_count", "first_event", "last_event", "start_time", "end_time"
+            ]
+            assert "_agents" not in snapshot.to_dict()
+
+    @pytest.mark.asyncio
+    async def test_live_snapshot_matches_projection(self):
+        """Test that the Observer's live snapshot equals a full projection."""
+        async with Observer(MemoryEventStore(), snapshot_cache=True) as observer:
+            for i in range(4):
+                await observer.record(
+                    event_type=EventType.EXECUTION_MESSAGE,
+                    correlation_id="session_001",
+                    payload={"content": f"Message {i}", "name": f"Agent{i % 3}"},
+                    source=EventSource(origin=EventOrigin.AGENT, agent_name=f"Agent{i % 3}")
+                )
+            await observer.record(
+                event_type=EventType.EXECUTION_COMPLETED,
+                correlation_id="session_001",
+                payload={"reason": "done"}
+            )
+
+            live = observer.get_snapshot("session_001")
+            projected = SnapshotProjection().project(await observer.get_events("session_001"))
+
+            assert live.to_dict() == projected.to_dict()
+            assert ChatSnapshot.from_json(live.to_json_bytes()).to_dict() == live.to_dict()
+            assert live.chat_type == "group"
+            assert live.round_count == 4
+            assert live.is_terminated
+            assert observer.get_snapshot("unknown") is None
+
+            # A loaded snapshot remembers its agents when folding new events
+            loaded = ChatSnapshot.from_json(live.to_json_bytes())
+            loaded.apply(EventEnvelope.create(
+                event_type=EventType.EXECUTION_MESSAGE,
+                correlation_id="session_001",
+                payload={"content": "More"},
+                source=EventSource(origin=EventOrigin.AGENT, agent_name="Agent0")
+            ))
+            assert loaded.chat_type == "group"
+
+    @pytest.mark.asyncio
+    async def test_live_snapshot_failure_does_not_fail_record(self):
+        """Test that an event the live snapshot can't fold is still recorded."""
+        async with Observer(MemoryEventStore(), snapshot_cache=True) as observer:
+            await observer.record(
+                event_type=EventType.EXECUTION_MESSAGE,
+                correlation_id="session_001",
+                payload={"content": "Hello"}
+            )
+            await observer.record(
+                event_type=EventType.EXECUTION_STATE_CHANGE,
+                correlation_id="session_001",
+                payload={"context_variables": 42}
+            )
+            await observer.record(
+                event_type=EventType.EXECUTION_MESSAGE,
+                correlation_id="session_001",
+                payload={"content": "World"}
+            )
+
+            assert await observer.count() == 3
+            assert observer.get_snapshot("session_001") is None
 
     @pytest.mark.asyncio
     async def test_empty_events_raises(self):